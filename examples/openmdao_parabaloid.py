@@ -27,9 +27,9 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
-import grpc
 import openmdao.api as om
 import philote_mdo.openmdao as pmom
+from philote_mdo.general import create_channel
 
 
 # this script should be run with the corresponding paraboloid server
@@ -39,7 +39,7 @@ model = prob.model
 
 model.add_subsystem(
     "Paraboloid",
-    pmom.RemoteExplicitComponent(channel=grpc.insecure_channel("localhost:50051")),
+    pmom.RemoteExplicitComponent(channel=create_channel("localhost:50051")),
     promotes=["*"],
 )
 
@@ -27,12 +27,11 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
-import grpc
 import numpy as np
 import philote_mdo.general as pmdo
 
 
-client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+client = pmdo.ExplicitClient(channel=pmdo.create_channel("localhost:50051"))
 
 # transfer the stream options to the server
 client.send_stream_options()
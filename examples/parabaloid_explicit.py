@@ -39,7 +39,7 @@ def run():
     discipline = pmdo.ExplicitServer(discipline=Paraboloid())
     discipline.attach_to_server(server)
 
-    server.add_insecure_port("[::]:50051")
+    pmdo.add_endpoints(server, port="50051")
     server.start()
     print("Server started. Listening on port 50051.")
     server.wait_for_termination()
@@ -27,13 +27,12 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
-import grpc
 import numpy as np
-from philote_mdo.general import ImplicitClient
+from philote_mdo.general import ImplicitClient, create_channel
 from philote_mdo.utils import PairDict
 
 
-client = ImplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+client = ImplicitClient(channel=create_channel("localhost:50051"))
 
 # transfer the stream options to the server
 client.send_stream_options()
@@ -53,3 +53,10 @@ class Rosenbrock(pmdo.ExplicitDiscipline):
 
     def compute_partials(self, inputs, partials):
         partials["f", "x"] = rosen_der(inputs["x"])
+
+    def compute_batch(self, inputs, outputs):
+        # rosen and rosen_der operate along the first axis
+        outputs["f"][:, 0] = rosen(inputs["x"].T)
+
+    def compute_partials_batch(self, inputs, partials):
+        partials["f", "x"][:] = rosen_der(inputs["x"].T).T
@@ -30,11 +30,21 @@
 from .discipline_client import DisciplineClient
 from .explicit_client import ExplicitClient
 from .implicit_client import ImplicitClient
+from .async_discipline_client import AsyncDisciplineClient
+from .async_explicit_client import AsyncExplicitClient
+from .async_implicit_client import AsyncImplicitClient
 
 from .discipline_server import DisciplineServer
 from .explicit_server import ExplicitServer
 from .implicit_server import ImplicitServer
+from .async_discipline_server import AsyncDisciplineServer
+from .async_explicit_server import AsyncExplicitServer
+from .async_implicit_server import AsyncImplicitServer
+
+from .endpoints import add_endpoints, create_channel, resolve_address, get_uds_path
+from .run_server import run_server
 
 from .discipline import Discipline
 from .explicit_discipline import ExplicitDiscipline
 from .implicit_discipline import ImplicitDiscipline
+from .process_pool import ProcessPoolDiscipline
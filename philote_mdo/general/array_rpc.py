@@ -0,0 +1,124 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import grpc
+from philote_mdo.utils import serialize_array, deserialize_array
+
+
+# fully qualified names of the array streaming services
+EXPLICIT_SERVICE = "philote.ExplicitService"
+IMPLICIT_SERVICE = "philote.ImplicitService"
+
+# invocation metadata keys of the array streaming RPCs
+BATCH_SIZE_KEY = "philote-batch-size"
+SHARED_MEMORY_KEY = "philote-shared-memory"
+SHARED_MEMORY_TOKEN_KEY = "philote-shared-memory-token"
+
+# peer address prefixes of clients on the same host
+_LOCAL_PEERS = ("unix:", "unix-abstract:", "ipv4:127.", "ipv6:[::1]")
+
+
+def get_metadata_value(context, key, default=None):
+    """
+    Returns the value of an invocation metadata entry of an RPC.
+    """
+    try:
+        metadata = tuple(context.invocation_metadata())
+    except (AttributeError, TypeError):
+        # the servicer was called without a gRPC context
+        return default
+
+    for entry_key, value in metadata:
+        if entry_key == key:
+            return value
+
+    return default
+
+
+def is_local_peer(context):
+    """
+    Returns True, if the peer of an RPC is on the same host (connected via a
+    Unix domain socket or the loopback interface).
+    """
+    try:
+        peer = context.peer()
+    except AttributeError:
+        return False
+
+    return isinstance(peer, str) and peer.startswith(_LOCAL_PEERS)
+
+
+class ArrayStreamStub:
+    """
+    Client stub for array streaming services that uses the packed array codec.
+
+    Every method is a stream-stream call that accepts data.Array or
+    PackedArray messages and returns PackedArray messages.
+    """
+
+    def __init__(self, channel, service, methods):
+        for method in methods:
+            setattr(
+                self,
+                method,
+                channel.stream_stream(
+                    "/{}/{}".format(service, method),
+                    request_serializer=serialize_array,
+                    response_deserializer=deserialize_array,
+                ),
+            )
+
+
+def add_array_stream_handlers(server, service, handlers):
+    """
+    Registers stream-stream array RPCs with a gRPC server.
+
+    The requests are decoded as PackedArray messages and the responses may
+    either be data.Array or PackedArray messages.
+
+    Parameters
+    ----------
+    server : grpc.Server
+        the gRPC server the handlers are added to
+    service : string
+        fully qualified name of the service
+    handlers : dict
+        dictionary mapping the RPC names to the servicer methods
+    """
+    rpc_handlers = {}
+    for name, method in handlers.items():
+        rpc_handlers[name] = grpc.stream_stream_rpc_method_handler(
+            method,
+            request_deserializer=deserialize_array,
+            response_serializer=serialize_array,
+        )
+
+    server.add_generic_rpc_handlers(
+        (grpc.method_handlers_generic_handler(service, rpc_handlers),)
+    )
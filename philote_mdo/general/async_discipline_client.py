@@ -0,0 +1,153 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import google.protobuf.empty_pb2 as empty
+import philote_mdo.generated.data_pb2 as data
+import philote_mdo.utils as utils
+from philote_mdo.general.discipline_client import DisciplineClient
+
+
+async def collect_responses(call):
+    """
+    Receives all responses of an asynchronous streaming call.
+    """
+    return [message async for message in call]
+
+
+class AsyncDisciplineClient(DisciplineClient):
+    """
+    Base class for asynchronous analysis discipline clients.
+
+    The client uses a grpc.aio channel. All RPCs are coroutines, so that one
+    event loop can drive many concurrent evaluations (e.g., with
+    asyncio.gather). The message assembly and recovery is shared with the
+    blocking clients.
+
+    Note, that buffer reuse and the shared memory transport should not be
+    enabled if evaluations run concurrently, as all coroutines of an event
+    loop share the same buffers.
+    """
+
+    def __init__(self, channel):
+        super().__init__(channel)
+
+    async def get_discipline_info(self):
+        """
+        Gets the discipline properties from the analysis server.
+        """
+        response = await collect_responses(self._disc_stub.GetInfo(empty.Empty()))
+        self._is_continuous = response[0].continuous
+        self._is_differentiable = response[0].differentiable
+        self._provides_gradients = response[0].provides_gradients
+
+    async def send_stream_options(self):
+        """
+        Transmits the stream options for the remote analysis to the server.
+        """
+        if self._shared is None:
+            await self._disc_stub.SetStreamOptions(self._stream_options)
+        else:
+            await self._disc_stub.SetStreamOptions(
+                self._stream_options, metadata=self._shared_metadata()
+            )
+
+    async def enable_shared_memory(self):
+        """
+        Switches to the shared memory transport (see
+        DisciplineClient.enable_shared_memory).
+        """
+        await self.disable_shared_memory(notify=False)
+        self._shared = utils.SharedBuffers(self.get_layout())
+        await self.send_stream_options()
+
+    async def disable_shared_memory(self, notify=True):
+        """
+        Switches back to transmitting the arrays through gRPC and releases the
+        shared memory segments.
+        """
+        if self._shared is None:
+            return
+
+        if notify:
+            await self._disc_stub.SetStreamOptions(
+                self._stream_options, metadata=self._shared_metadata(attach=False)
+            )
+
+        shared = self._shared
+        self._shared = None
+        shared.close()
+
+    async def get_available_options(self):
+        """
+        Gets the available options for the analysis discipline.
+        """
+        opts = await self._disc_stub.GetAvailableOptions(empty.Empty())
+
+        for name, val in zip(opts.options, opts.type):
+            type_str = None
+            if val == data.kBool:
+                type_str = "bool"
+            if val == data.kInt:
+                type_str = "int"
+            if val == data.kDouble:
+                type_str = "float"
+            if val == data.kString:
+                type_str = "str"
+            self.options_list[name] = type_str
+
+    async def send_options(self, options):
+        """
+        Sends the discipline options to the analysis server.
+        """
+        proto_options = data.DisciplineOptions()
+        proto_options.options.update(options)
+        await self._disc_stub.SetOptions(proto_options)
+
+    async def run_setup(self):
+        """
+        Runs the setup function on the analysis server.
+        """
+        await self._disc_stub.Setup(empty.Empty())
+
+    async def get_variable_definitions(self):
+        """
+        Requests the input and output metadata from the server.
+        """
+        async for message in self._disc_stub.GetVariableDefinitions(empty.Empty()):
+            self._var_meta += [message]
+        self._layout = None
+
+    async def get_partials_definitions(self):
+        """
+        Requests metadata information on the partials from the analysis server.
+        """
+        async for message in self._disc_stub.GetPartialDefinitions(empty.Empty()):
+            if message.name not in self._partials_meta:
+                self._partials_meta += [message]
+        self._layout = None
@@ -0,0 +1,158 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import asyncio
+import functools
+import inspect
+from google.protobuf.empty_pb2 import Empty
+from philote_mdo.general.discipline_server import DisciplineServer
+
+
+async def collect_requests(request_iterator):
+    """
+    Receives all request messages of an asynchronous streaming call.
+    """
+    return [message async for message in request_iterator]
+
+
+class AsyncDisciplineServer(DisciplineServer):
+    """
+    Base class for asynchronous (grpc.aio) server classes.
+
+    Discipline functions defined with 'async def' are awaited on the event
+    loop. Regular (possibly CPU-bound) discipline functions are run in an
+    executor, so that they do not block the event loop. The executor
+    defaults to the default executor of the event loop.
+
+    Note, that all requests share the event loop thread, so the server does
+    not reuse buffers across calls.
+    """
+
+    def __init__(self, discipline=None, executor=None):
+        super().__init__(discipline=discipline)
+
+        # executor for synchronous discipline functions
+        self.executor = executor
+
+    def get_allocator(self):
+        """
+        Returns the object used to allocate the variable and partials arrays.
+
+        Persistent buffer arenas are per thread, which would be shared by all
+        concurrent requests of the event loop, so they are not used.
+        """
+        return self.get_layout()
+
+    async def GetInfo(self, request, context):
+        """
+        RPC that sends the discipline information/properties to the client.
+        """
+        for message in super().GetInfo(request, context):
+            yield message
+
+    async def SetStreamOptions(self, request, context):
+        """
+        Receives the stream options (and negotiates the transport).
+        """
+        self._stream_opts = request
+
+        error = self.negotiate_shared_memory(context)
+        if error is not None:
+            await context.abort(*error)
+
+        return Empty()
+
+    async def GetAvailableOptions(self, request, context):
+        """
+        RPC that gets the names and types of all available discipline options.
+        """
+        return super().GetAvailableOptions(request, context)
+
+    async def SetOptions(self, request, context):
+        """
+        RPC that sets the discipline options.
+        """
+        return super().SetOptions(request, context)
+
+    async def Setup(self, request, context):
+        """
+        RPC that runs the setup function (in the executor).
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(super().Setup, request, context)
+        )
+
+    async def GetVariableDefinitions(self, request, context):
+        """
+        Transmits variable metadata about the analysis discipline to the client.
+        """
+        for message in super().GetVariableDefinitions(request, context):
+            yield message
+
+    async def GetPartialDefinitions(self, request, context):
+        """
+        Transmits partials metadata about the analysis discipline to the client.
+        """
+        for message in super().GetPartialDefinitions(request, context):
+            yield message
+
+    async def call_discipline(self, function, *args):
+        """
+        Calls a discipline function. Coroutine functions are awaited and
+        regular functions are run in the executor.
+        """
+        if inspect.iscoroutinefunction(function):
+            return await function(*args)
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(function, *args)
+        )
+
+    async def cached_evaluation_async(self, kind, state, function, args, result):
+        """
+        Asynchronous variant of cached_evaluation.
+
+        Calls the discipline function with the given arguments (see
+        call_discipline), unless the result is available from the cache.
+        """
+        if self.cache is None:
+            await self.call_discipline(function, *args)
+            return result
+
+        key = self.evaluation_key(kind, state)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        await self.call_discipline(function, *args)
+        self.cache_result(key, state, result)
+        return result
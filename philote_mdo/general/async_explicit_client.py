@@ -0,0 +1,154 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import asyncio
+import grpc
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.general.array_rpc import BATCH_SIZE_KEY
+from philote_mdo.general.async_discipline_client import (
+    AsyncDisciplineClient,
+    collect_responses,
+)
+from philote_mdo.general.explicit_client import ExplicitClient, _get_num_points
+
+
+class AsyncExplicitClient(AsyncDisciplineClient, ExplicitClient):
+    """
+    Asynchronous client for calling explicit analysis discipline servers.
+
+    The channel must be a grpc.aio channel. The compute functions are
+    coroutines with the same arguments and return values as the functions
+    of ExplicitClient.
+    """
+
+    def __init__(self, channel):
+        super().__init__(channel)
+
+    async def run_compute(self, inputs):
+        """
+        Requests and receives the function evaluation from the analysis server
+        for a set of inputs (sent to the server).
+        """
+        messages = self._assemble_input_messages(inputs)
+        call = self._explicit_stub().ComputeFunction(messages)
+        return self._recover_outputs(await collect_responses(call))
+
+    async def run_compute_partials(self, inputs):
+        """
+        Requests and receives the gradient evaluation from the analysis server
+        for a set of inputs (sent to the server).
+        """
+        messages = self._assemble_input_messages(inputs)
+        call = self._explicit_stub().ComputeGradient(messages)
+        return self._recover_partials(await collect_responses(call))
+
+    async def run_compute_with_partials(self, inputs):
+        """
+        Requests and receives the function and gradient evaluation from the
+        analysis server with a single RPC. Returns the outputs and the
+        partials. If the server does not implement this RPC, the function and
+        gradient are requested separately.
+        """
+        if "ComputeFunctionAndGradient" not in self._unimplemented:
+            messages = self._assemble_input_messages(inputs)
+            call = self._expl_packed_stub.ComputeFunctionAndGradient(messages)
+            try:
+                responses = await collect_responses(call)
+                return self._recover_outputs_and_partials(responses)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeFunctionAndGradient")
+
+        outputs = await self.run_compute(inputs)
+        return outputs, await self.run_compute_partials(inputs)
+
+    async def run_compute_batch(self, inputs):
+        """
+        Requests and receives the function evaluations for a batch of points
+        from the analysis server. If the server does not implement batch
+        evaluations, the points are evaluated concurrently.
+        """
+        num_points = _get_num_points(inputs)
+
+        if "ComputeFunctionBatch" not in self._unimplemented:
+            messages = self._assemble_batch_messages(inputs)
+            call = self._expl_packed_stub.ComputeFunctionBatch(
+                messages, metadata=((BATCH_SIZE_KEY, str(num_points)),)
+            )
+            try:
+                responses = await collect_responses(call)
+                return self._recover_outputs(responses, num_points)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeFunctionBatch")
+
+        points = await asyncio.gather(
+            *[
+                self.run_compute({name: val[i] for name, val in inputs.items()})
+                for i in range(num_points)
+            ]
+        )
+
+        _, outputs, _ = self.get_layout().allocate_batch(data.kOutput, num_points)
+        for i, point in enumerate(points):
+            for name, value in point.items():
+                outputs[name][i] = value
+
+        return outputs
+
+    async def run_compute_partials_batch(self, inputs):
+        """
+        Requests and receives the gradient evaluations for a batch of points
+        from the analysis server. If the server does not implement batch
+        evaluations, the points are evaluated concurrently.
+        """
+        num_points = _get_num_points(inputs)
+
+        if "ComputeGradientBatch" not in self._unimplemented:
+            messages = self._assemble_batch_messages(inputs)
+            call = self._expl_packed_stub.ComputeGradientBatch(
+                messages, metadata=((BATCH_SIZE_KEY, str(num_points)),)
+            )
+            try:
+                responses = await collect_responses(call)
+                return self._recover_partials(responses, num_points)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeGradientBatch")
+
+        points = await asyncio.gather(
+            *[
+                self.run_compute_partials({name: val[i] for name, val in inputs.items()})
+                for i in range(num_points)
+            ]
+        )
+
+        _, partials, _ = self.get_layout().allocate_partials_batch(num_points)
+        for i, point in enumerate(points):
+            for pair, value in point.items():
+                partials[pair][i] = value
+
+        return partials
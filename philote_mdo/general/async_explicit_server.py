@@ -0,0 +1,151 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.general.array_rpc import BATCH_SIZE_KEY, get_metadata_value
+from philote_mdo.general.async_discipline_server import (
+    AsyncDisciplineServer,
+    collect_requests,
+)
+from philote_mdo.general.explicit_server import ExplicitServer
+
+
+class AsyncExplicitServer(AsyncDisciplineServer, ExplicitServer):
+    """
+    Asynchronous explicit discipline server for grpc.aio servers.
+
+    The discipline functions (compute, compute_partials, ...) may be
+    coroutine functions. The messages and transports are the same as for
+    ExplicitServer.
+    """
+
+    def __init__(self, discipline=None, executor=None):
+        super().__init__(discipline=discipline, executor=executor)
+
+    async def ComputeFunction(self, request_iterator, context):
+        """
+        Computes the function evaluation and sends the result to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        self.get_allocator().allocate(data.kOutput, outputs)
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, state=state)
+        outputs = await self.cached_evaluation_async(
+            "ComputeFunction",
+            state,
+            self._discipline.compute,
+            (inputs, outputs),
+            outputs,
+        )
+
+        for message in self._respond(transport, outputs):
+            yield message
+
+    async def ComputeGradient(self, request_iterator, context):
+        """
+        Computes the gradient evaluation and sends the result to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        jac = self.preallocate_partials()
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, state=state)
+        jac = await self.cached_evaluation_async(
+            "ComputeGradient",
+            state,
+            self._discipline.compute_partials,
+            (inputs, jac),
+            jac,
+        )
+
+        for message in self._respond(transport, partials=jac):
+            yield message
+
+    async def ComputeFunctionAndGradient(self, request_iterator, context):
+        """
+        Computes the function and gradient evaluation for one set of inputs
+        and sends both results to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        self.get_allocator().allocate(data.kOutput, outputs)
+        jac = self.preallocate_partials()
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, state=state)
+        outputs, jac = await self.cached_evaluation_async(
+            "ComputeFunctionAndGradient",
+            state,
+            self._discipline.compute_with_partials,
+            (inputs, outputs, jac),
+            (outputs, jac),
+        )
+
+        for message in self._respond(transport, outputs, jac):
+            yield message
+
+    async def ComputeFunctionBatch(self, request_iterator, context):
+        """
+        Computes the function evaluation for a batch of points and sends the
+        results to the client.
+        """
+        num_points = int(get_metadata_value(context, BATCH_SIZE_KEY, 1))
+        layout = self.get_layout()
+
+        _, inputs, flat_inputs = layout.allocate_batch(data.kInput, num_points)
+        _, outputs, _ = layout.allocate_batch(data.kOutput, num_points)
+        self.process_inputs(await collect_requests(request_iterator), flat_inputs)
+        await self.call_discipline(self._discipline.compute_batch, inputs, outputs)
+
+        for message in self._output_messages(outputs):
+            yield message
+
+    async def ComputeGradientBatch(self, request_iterator, context):
+        """
+        Computes the gradient evaluation for a batch of points and sends the
+        results to the client.
+        """
+        num_points = int(get_metadata_value(context, BATCH_SIZE_KEY, 1))
+        layout = self.get_layout()
+
+        _, inputs, flat_inputs = layout.allocate_batch(data.kInput, num_points)
+        _, jac, _ = layout.allocate_partials_batch(num_points)
+        self.process_inputs(await collect_requests(request_iterator), flat_inputs)
+        await self.call_discipline(self._discipline.compute_partials_batch, inputs, jac)
+
+        for message in self._partials_messages(jac):
+            yield message
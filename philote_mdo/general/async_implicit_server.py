@@ -0,0 +1,123 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.general.async_discipline_server import (
+    AsyncDisciplineServer,
+    collect_requests,
+)
+from philote_mdo.general.implicit_server import ImplicitServer
+
+
+class AsyncImplicitServer(AsyncDisciplineServer, ImplicitServer):
+    """
+    Asynchronous implicit discipline server for grpc.aio servers.
+
+    The discipline functions (compute_residuals, solve_residuals, ...) may be
+    coroutine functions. The messages and transports are the same as for
+    ImplicitServer.
+    """
+
+    def __init__(self, discipline=None, executor=None):
+        super().__init__(discipline=discipline, executor=executor)
+
+    async def ComputeResiduals(self, request_iterator, context):
+        """
+        Computes the residuals and sends the results to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+        flat_outputs = {}
+        residuals = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        self.get_allocator().allocate(data.kResidual, residuals)
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, flat_outputs, state)
+
+        residuals = await self.cached_evaluation_async(
+            "ComputeResiduals",
+            state,
+            self._discipline.compute_residuals,
+            (inputs, outputs, residuals),
+            residuals,
+        )
+
+        for message in self._respond(transport, residuals, data.kResidual):
+            yield message
+
+    async def SolveResiduals(self, request_iterator, context):
+        """
+        Solves the implicit discipline so that the residuals are driven to zero.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+        flat_outputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, flat_outputs, state)
+
+        outputs = await self.cached_evaluation_async(
+            "SolveResiduals",
+            state,
+            self._discipline.solve_residuals,
+            (inputs, outputs),
+            outputs,
+        )
+
+        for message in self._respond(transport, outputs, data.kOutput):
+            yield message
+
+    async def ComputeResidualGradients(self, request_iterator, context):
+        """
+        Computes the residual gradients and sends the results to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+        flat_outputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        jac = self.preallocate_partials()
+        requests = await collect_requests(request_iterator)
+        transport = self.process_inputs(requests, flat_inputs, flat_outputs, state)
+
+        jac = await self.cached_evaluation_async(
+            "ComputeResidualGradients",
+            state,
+            self._discipline.residual_partials,
+            (inputs, outputs, jac),
+            jac,
+        )
+
+        for message in self._respond(transport, jac, data.kPartial):
+            yield message
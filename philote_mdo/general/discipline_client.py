@@ -27,11 +27,12 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
-import numpy as np
+import threading
 import google.protobuf.empty_pb2 as empty
 import philote_mdo.generated.data_pb2 as data
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 import philote_mdo.utils as utils
+from philote_mdo.general.array_rpc import SHARED_MEMORY_KEY, SHARED_MEMORY_TOKEN_KEY
 
 
 class DisciplineClient:
@@ -57,10 +58,34 @@ class DisciplineClient:
         # streaming options
         self._stream_options = data.StreamOptions(num_double=1000)
 
+        # transmit array chunks as raw little-endian byte blocks instead of
+        # copying them value by value. the packed encoding is identical to the
+        # standard data.Array encoding on the wire, so it does not need to be
+        # supported by the server.
+        self.packed_arrays = False
+
+        # transmit all inputs (and outputs) as one contiguous state vector per
+        # variable type instead of one array stream per variable. the offsets
+        # are given by the variable layout, which the server compiles from
+        # the same metadata. the server responds in the same format.
+        self.state_vector_transport = False
+
         # variable and partials metadata
         self._var_meta = []
         self._partials_meta = []
 
+        # precomputed variable and partials layout
+        self._layout = None
+
+        # reuse persistent buffers for the recovered outputs, residuals and
+        # partials. note, that the arrays returned by one call are then
+        # overwritten by the next call (of the same kind) on the same thread.
+        self.reuse_buffers = False
+        self._arenas = threading.local()
+
+        # shared memory buffers (see enable_shared_memory)
+        self._shared = None
+
         # list of available options
         self.options_list = {}
 
@@ -77,7 +102,60 @@ class DisciplineClient:
         """
         Transmits the stream options for the remote analysis to the server.
         """
-        self._disc_stub.SetStreamOptions(self._stream_options)
+        if self._shared is None:
+            self._disc_stub.SetStreamOptions(self._stream_options)
+        else:
+            self._disc_stub.SetStreamOptions(
+                self._stream_options, metadata=self._shared_metadata()
+            )
+
+    def _shared_metadata(self, attach=True):
+        """
+        Returns the invocation metadata that negotiates the shared memory
+        buffers with the server.
+
+        The buffers are identified by their token. Without the segment names
+        (attach is False), the server releases the buffers of the token.
+        """
+        metadata = [(SHARED_MEMORY_TOKEN_KEY, self._shared.token)]
+        if attach:
+            metadata.append((SHARED_MEMORY_KEY, self._shared.to_json()))
+
+        return metadata
+
+    def enable_shared_memory(self):
+        """
+        Switches to the shared memory transport.
+
+        This transport is only available if the client and server run on the
+        same machine. The variable and partials buffers are allocated as
+        shared memory segments, which are sized from the variable layout.
+        The segment names are sent to the server with the stream options,
+        along with a token that identifies the buffers of this client in
+        every compute request. After that, compute requests only carry a "buffers ready" signal and
+        the arrays are never copied through gRPC. Must be called after setup
+        and after receiving the variable and partials definitions.
+        """
+        self.disable_shared_memory(notify=False)
+        self._shared = utils.SharedBuffers(self.get_layout())
+        self.send_stream_options()
+
+    def disable_shared_memory(self, notify=True):
+        """
+        Switches back to transmitting the arrays through gRPC and releases the
+        shared memory segments.
+        """
+        if self._shared is None:
+            return
+
+        if notify:
+            self._disc_stub.SetStreamOptions(
+                self._stream_options, metadata=self._shared_metadata(attach=False)
+            )
+
+        shared = self._shared
+        self._shared = None
+        shared.close()
 
     def get_available_options(self):
         """
@@ -126,6 +204,7 @@ class DisciplineClient:
         """
         for message in self._disc_stub.GetVariableDefinitions(empty.Empty()):
             self._var_meta += [message]
+        self._layout = None
 
     def get_partials_definitions(self):
         """
@@ -134,61 +213,118 @@ class DisciplineClient:
         for message in self._disc_stub.GetPartialDefinitions(empty.Empty()):
             if message.name not in self._partials_meta:
                 self._partials_meta += [message]
+        self._layout = None
+
+    def get_layout(self):
+        """
+        Returns the variable and partials layout of the remote discipline.
+
+        The layout is compiled once from the metadata received from the server
+        and reused for all compute calls. It is only recompiled if the
+        metadata has changed.
+        """
+        if self._layout is None or not self._layout.matches(
+            self._var_meta, self._partials_meta
+        ):
+            self._layout = utils.VariableLayout(self._var_meta, self._partials_meta)
+
+        return self._layout
+
+    def get_allocator(self):
+        """
+        Returns the object used to allocate the recovered arrays.
+
+        By default, this is the layout itself (new arrays for every call). If
+        buffer reuse is enabled, a persistent buffer arena of the calling
+        thread is returned instead.
+        """
+        layout = self.get_layout()
+
+        if not self.reuse_buffers:
+            return layout
+
+        arena = getattr(self._arenas, "arena", None)
+        if arena is None or arena.layout is not layout:
+            arena = self._arenas.arena = utils.BufferArena(layout)
+
+        return arena
 
     def _assemble_input_messages(self, inputs, outputs=None):
         """
-        Assembles the messages for transmitting the input variables to the
-        server.
+        Lazily assembles the messages for transmitting the input variables to
+        the server.
+
+        This function is a generator, so that the chunks are created while
+        gRPC is sending them. Only the chunk that is currently being
+        transmitted is held in memory.
         """
-        messages = []
+        if self._shared is not None:
+            # one "buffers ready" signal per variable type that was written
+            token = self._shared.token
+            self._shared.write(data.kInput, inputs)
+            yield data.Array(
+                name=utils.SHARED_MEMORY_NAME, subname=token, type=data.kInput
+            )
 
-        for input_name, value in inputs.items():
-            for b, e in utils.get_chunk_indices(
-                value.size, self._stream_options.num_double
-            ):
-                messages += [
-                    data.Array(
-                        name=input_name,
-                        start=b,
-                        end=e - 1,
-                        type=data.VariableType.kInput,
-                        data=value.ravel()[b:e],
-                    )
-                ]
+            if outputs:
+                self._shared.write(data.kOutput, outputs)
+                yield data.Array(
+                    name=utils.SHARED_MEMORY_NAME, subname=token, type=data.kOutput
+                )
+            return
+
+        if self.state_vector_transport:
+            layout = self.get_layout()
+            inputs = {utils.STATE_VECTOR_NAME: layout.pack(data.kInput, inputs)}
+            if outputs:
+                outputs = {utils.STATE_VECTOR_NAME: layout.pack(data.kOutput, outputs)}
+
+        yield from self._assemble_array_messages(inputs, data.VariableType.kInput)
 
         if outputs:
-            for output_name, value in outputs.items():
-                for b, e in utils.get_chunk_indices(
-                    value.size, self._stream_options.num_double
-                ):
-                    messages += [
-                        data.Array(
-                            name=output_name,
-                            start=b,
-                            end=e - 1,
-                            type=data.VariableType.kOutput,
-                            data=value.ravel()[b:e],
-                        )
-                    ]
-
-        return messages
-
-    def _recover_outputs(self, responses):
+            yield from self._assemble_array_messages(
+                outputs, data.VariableType.kOutput
+            )
+
+    def _assemble_array_messages(self, arrays, var_type):
         """
-        Recovers the outputs from the stream of responses.
+        Generates the array chunk messages for a dictionary of arrays.
         """
-        outputs = {}
-        flat_outputs = {}
+        array_type = utils.PackedArray if self.packed_arrays else data.Array
 
+        for name, value in arrays.items():
+            flat_value = value.ravel()
+            for b, e in utils.get_chunk_indices(
+                flat_value.size, self._stream_options.num_double
+            ):
+                yield array_type(
+                    name=name,
+                    start=b,
+                    end=e - 1,
+                    type=var_type,
+                    data=flat_value[b:e],
+                )
+
+    def _recover_outputs(self, responses, num_points=None):
+        """
+        Recovers the outputs from the stream of responses.
+
+        If the number of points is given, the outputs of a batch evaluation
+        (with a leading batch axis) are recovered.
+        """
         # preallocate
-        for out in self._var_meta:
-            if out.type == data.kOutput:
-                name = out.name
-                outputs[name] = np.zeros(out.shape)
-                flat_outputs[name] = utils.get_flattened_view(outputs[name])
+        if num_points is None:
+            state, outputs, flat_outputs = self.get_allocator().allocate(data.kOutput)
+        else:
+            state, outputs, flat_outputs = self.get_layout().allocate_batch(
+                data.kOutput, num_points
+            )
+        flat_outputs[utils.STATE_VECTOR_NAME] = state
 
         for message in responses:
-            if message.type == data.kOutput:
+            if message.name == utils.SHARED_MEMORY_NAME:
+                state[:] = self._shared.vectors[data.kOutput]
+            elif message.type == data.kOutput:
                 b = message.start
                 e = message.end + 1
                 if len(message.data) > 0:
@@ -204,18 +340,16 @@ class DisciplineClient:
         """
         Recovers the residuals from the stream of responses.
         """
-        residuals = {}
-        flat_residuals = {}
-
         # preallocate
-        for res in self._var_meta:
-            if res.type == data.kResidual:
-                name = res.name
-                residuals[name] = np.zeros(res.shape)
-                flat_residuals[name] = utils.get_flattened_view(residuals[name])
+        state, residuals, flat_residuals = self.get_allocator().allocate(
+            data.kResidual
+        )
+        flat_residuals[utils.STATE_VECTOR_NAME] = state
 
         for message in responses:
-            if message.type == data.kResidual:
+            if message.name == utils.SHARED_MEMORY_NAME:
+                state[:] = self._shared.vectors[data.kResidual]
+            elif message.type == data.kResidual:
                 b = message.start
                 e = message.end + 1
                 if len(message.data) > 0:
@@ -227,40 +361,28 @@ class DisciplineClient:
 
         return residuals
 
-    def _recover_partials(self, responses):
+    def _recover_partials(self, responses, num_points=None):
         """
         Recovers the partials from the stream of responses.
-        """
-        partials = utils.PairDict()
-        flat_p = utils.PairDict()
 
+        If the number of points is given, the partials of a batch evaluation
+        (with a leading batch axis) are recovered.
+        """
         # preallocate
-        for part in self._partials_meta:
-            shapef = tuple([d.shape for d in self._var_meta if d.name == part.name][0])
-            shapex = tuple(
-                [d.shape for d in self._var_meta if d.name == part.subname][0]
-            )
-
-            if shapef == (1,):
-                if shapex == (1,):
-                    shape = (1,)
-                else:
-                    shape = shapex
-            elif shapex == (1,):
-                shape = shapef
-            else:
-                shape = shapef + shapex
-
-            partials[(part.name, part.subname)] = np.zeros(shape)
-            flat_p[(part.name, part.subname)] = utils.get_flattened_view(
-                partials[(part.name, part.subname)]
+        if num_points is None:
+            vector, partials, flat_p = self.get_allocator().allocate_partials()
+        else:
+            vector, partials, flat_p = self.get_layout().allocate_partials_batch(
+                num_points
             )
 
         for message in responses:
             b = message.start
             e = message.end + 1
 
-            if message.type == data.kPartial:
+            if message.name == utils.SHARED_MEMORY_NAME:
+                vector[:] = self._shared.partials
+            elif message.type == data.kPartial:
                 if len(message.data) > 0:
                     flat_p[(message.name, message.subname)][b:e] = message.data
                 else:
@@ -270,3 +392,34 @@ class DisciplineClient:
                     )
 
         return partials
+
+    def _recover_outputs_and_partials(self, responses):
+        """
+        Recovers the outputs and the partials from one stream of responses.
+        """
+        # preallocate
+        allocator = self.get_allocator()
+        state, outputs, flat_outputs = allocator.allocate(data.kOutput)
+        flat_outputs[utils.STATE_VECTOR_NAME] = state
+        partials_vector, partials, flat_p = allocator.allocate_partials()
+
+        for message in responses:
+            b = message.start
+            e = message.end + 1
+
+            if message.name == utils.SHARED_MEMORY_NAME:
+                state[:] = self._shared.vectors[data.kOutput]
+                partials_vector[:] = self._shared.partials
+                continue
+
+            if len(message.data) == 0:
+                raise ValueError(
+                    "Expected continuous variables, but array is empty."
+                )
+
+            if message.type == data.kOutput:
+                flat_outputs[message.name][b:e] = message.data
+            elif message.type == data.kPartial:
+                flat_p[(message.name, message.subname)][b:e] = message.data
+
+        return outputs, partials
@@ -27,12 +27,29 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import threading
 import numpy as np
 
 import philote_mdo.generated.data_pb2 as data
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 from google.protobuf.empty_pb2 import Empty
-from philote_mdo.utils import PairDict, get_flattened_view
+import grpc
+from philote_mdo.general.array_rpc import (
+    SHARED_MEMORY_KEY,
+    SHARED_MEMORY_TOKEN_KEY,
+    get_metadata_value,
+    is_local_peer,
+)
+from philote_mdo.utils import (
+    VariableLayout,
+    BufferArena,
+    PackedArray,
+    SharedBuffers,
+    get_chunk_indices,
+    evaluation_digest,
+    STATE_VECTOR_NAME,
+    SHARED_MEMORY_NAME,
+)
 
 
 class DisciplineServer(disc.DisciplineService):
@@ -49,6 +66,25 @@ class DisciplineServer(disc.DisciplineService):
         # discipline stream options
         self._stream_opts = data.StreamOptions(num_double=1000)
 
+        # precomputed variable and partials layout
+        self._layout = None
+
+        # options most recently set by the client
+        self._options = data.DisciplineOptions()
+
+        # optional cache of evaluation results (e.g., an EvaluationCache)
+        self.cache = None
+
+        # reuse persistent (per worker thread) buffers across compute calls
+        # instead of allocating new arrays for every call
+        self.reuse_buffers = False
+        self._arenas = threading.local()
+
+        # shared memory buffers negotiated with co-located clients (keyed by
+        # the token of the buffers)
+        self._shared = {}
+        self._shared_lock = threading.Lock()
+
     def attach_to_server(self, server):
         """
         Attaches this discipline server class to a gRPC server.
@@ -76,10 +112,61 @@ class DisciplineServer(disc.DisciplineService):
         Receives options from the client on how data will be transmitted to and
         received from the client. The options are stores locally for use in the
         compute routines.
+
+        A co-located client may also negotiate the shared memory transport
+        (see negotiate_shared_memory).
         """
         self._stream_opts = request
+
+        error = self.negotiate_shared_memory(context)
+        if error is not None:
+            context.abort(*error)
+
         return Empty()
 
+    def negotiate_shared_memory(self, context):
+        """
+        Attaches to (or detaches from) the shared memory buffers of a client.
+
+        The client sends the token of its buffers and the names of its shared
+        memory segments as invocation metadata. A token without names
+        releases the buffers of that token. The buffers of other clients are
+        not affected. Segments are only accepted from clients on the same
+        host and must be owned by the user of the server process.
+
+        Returns
+        -------
+        None, or the status code and details of a rejected negotiation
+        """
+        token = get_metadata_value(context, SHARED_MEMORY_TOKEN_KEY)
+        if token is None:
+            return None
+
+        names = get_metadata_value(context, SHARED_MEMORY_KEY)
+        shared = None
+
+        if names is not None:
+            if not is_local_peer(context):
+                return (
+                    grpc.StatusCode.PERMISSION_DENIED,
+                    "Shared memory is only available to local clients.",
+                )
+
+            try:
+                shared = SharedBuffers.from_json(self.get_layout(), names, token)
+            except (OSError, ValueError) as error:
+                return grpc.StatusCode.INVALID_ARGUMENT, str(error)
+
+        with self._shared_lock:
+            previous = self._shared.pop(token, None)
+            if shared is not None:
+                self._shared[token] = shared
+
+        if previous is not None:
+            previous.close()
+
+        return None
+
     def GetAvailableOptions(self, request, context):
         """
         RPC that gets the names and types of all available discipline options.
@@ -112,6 +199,7 @@ class DisciplineServer(disc.DisciplineService):
         """
         options = request.options
         self._discipline.set_options(options)
+        self._options = request
         return Empty()
 
     def Setup(self, request, context):
@@ -121,6 +209,10 @@ class DisciplineServer(disc.DisciplineService):
         self._discipline._clear_data()
         self._discipline.setup()
         self._discipline.setup_partials()
+
+        # the layout is recompiled from the new metadata on first use
+        # (cached results are keyed by the layout, so they remain valid)
+        self._layout = None
         return Empty()
 
     def GetVariableDefinitions(self, request, context):
@@ -137,76 +229,137 @@ class DisciplineServer(disc.DisciplineService):
         for jac in self._discipline._partials_meta:
             yield jac
 
+    def get_layout(self):
+        """
+        Returns the variable and partials layout of the discipline.
+
+        The layout is compiled once after Setup and reused by all compute
+        RPCs. It is only recompiled if the discipline metadata has changed.
+        """
+        var_meta = self._discipline._var_meta
+        partials_meta = self._discipline._partials_meta
+
+        if self._layout is None or not self._layout.matches(var_meta, partials_meta):
+            self._layout = VariableLayout(var_meta, partials_meta)
+
+        return self._layout
+
+    def get_allocator(self):
+        """
+        Returns the object used to allocate the variable and partials arrays.
+
+        By default, this is the layout itself (new arrays for every call). If
+        buffer reuse is enabled, a persistent buffer arena of the current
+        worker thread is returned instead.
+        """
+        layout = self.get_layout()
+
+        if not self.reuse_buffers:
+            return layout
+
+        arena = getattr(self._arenas, "arena", None)
+        if arena is None or arena.layout is not layout:
+            arena = self._arenas.arena = BufferArena(layout)
+
+        return arena
+
+    def get_shared_buffers(self, token):
+        """
+        Returns the shared memory buffers negotiated with the token.
+
+        A ValueError is raised, if no buffers were negotiated with the token
+        or if they do not match the current layout.
+        """
+        with self._shared_lock:
+            shared = self._shared.get(token)
+
+        if shared is None:
+            raise ValueError("Shared memory transport was not negotiated.")
+
+        if shared.layout.digest() != self.get_layout().digest():
+            raise ValueError(
+                "Shared memory buffers do not match the layout of the discipline."
+            )
+
+        return shared
+
     def preallocate_inputs(self, inputs, flat_inputs, outputs=None, flat_outputs=None):
         """
         Preallocates the inputs before receiving data from the client.
 
         Note, for implicit disciplines, the function values are considered
         inputs to evaluate the residuals and the partials of the residuals.
-        """
-        for var in self._discipline._var_meta:
-            if var.type == data.kInput:
-                inputs[var.name] = np.zeros(var.shape)
-                flat_inputs[var.name] = get_flattened_view(inputs[var.name])
-
-            if (
-                var.type == data.kOutput
-                and outputs is not None
-                and flat_outputs is not None
-            ):
-                outputs[var.name] = np.zeros(var.shape)
-                flat_outputs[var.name] = get_flattened_view(outputs[var.name])
 
-    def preallocate_partials(self):
+        All arrays of one variable type are views into a contiguous state
+        vector. The state vectors are returned in a dictionary (keyed by the
+        variable type), so that they can be passed to process_inputs.
         """
-        Preallocates the partials.
+        allocator = self.get_allocator()
+        state = {}
 
-        Note: there are edge cases for this function, where either f or x, or
-        both are scalar. In those cases the shapes of the partials must be
-        treated differently.
-        """
-        jac = PairDict()
+        state[data.kInput], _, _ = allocator.allocate(data.kInput, inputs, flat_inputs)
 
-        for pair in self._discipline._partials_meta:
-            shapef = tuple(
-                [d.shape for d in self._discipline._var_meta if d.name == pair.name][0]
-            )
-            shapex = tuple(
-                [d.shape for d in self._discipline._var_meta if d.name == pair.subname][
-                    0
-                ]
+        if outputs is not None and flat_outputs is not None:
+            state[data.kOutput], _, _ = allocator.allocate(
+                data.kOutput, outputs, flat_outputs
             )
 
-            if shapef == (1,):
-                if shapex == (1,):
-                    shape = (1,)
-                else:
-                    shape = shapex
-            elif shapex == (1,):
-                shape = shapef
-            else:
-                shape = shapef + shapex
+        return state
 
-            jac[(pair.name, pair.subname)] = np.zeros(shape)
+    def preallocate_partials(self):
+        """
+        Preallocates the partials.
+
+        The shapes of the partials (including the edge cases, where either f
+        or x, or both are scalar) are taken from the precomputed layout.
+        """
+        _, jac, _ = self.get_allocator().allocate_partials()
 
         return jac
 
-    def process_inputs(self, request_iterator, flat_inputs, flat_outputs=None):
+    def process_inputs(self, request_iterator, flat_inputs, flat_outputs=None, state=None):
         """
         Processes the message inputs from a gRPC stream.
 
         Note, for implicit disciplines, the function values are considered
         inputs to evaluate the residuals and the partials of the residuals.
+
+        Chunks of a contiguous state vector (named STATE_VECTOR_NAME) are
+        written to the state vectors returned by preallocate_inputs. A chunk
+        named SHARED_MEMORY_NAME signals that the client has written the
+        variables of its type to the shared memory buffers identified by the
+        chunk's subname (the token). These variables are copied into the
+        state vectors. Variable types the client did not send keep their
+        zeroed values.
+
+        Returns
+        -------
+        STATE_VECTOR_NAME or the shared memory buffers of the client, if the
+        client used one of these transports, or None if the variables were
+        transmitted as individual arrays
         """
+        transport = None
+
         # process inputs
         for message in request_iterator:
             # start and end indices for the array chunk
             b = message.start
             e = message.end
 
+            # the variables already are in the shared buffers
+            if message.name == SHARED_MEMORY_NAME:
+                transport = self.get_shared_buffers(message.subname)
+                if state is None or message.type not in state:
+                    raise ValueError("Unexpected variable type in shared memory.")
+                state[message.type][:] = transport.vectors[message.type]
+                continue
+
             # assign either continuous or discrete data
             if len(message.data) > 0:
-                if message.type == data.VariableType.kInput:
+                if message.name == STATE_VECTOR_NAME and state is not None:
+                    state[message.type][b : e + 1] = message.data
+                    transport = STATE_VECTOR_NAME
+                elif message.type == data.VariableType.kInput:
                     flat_inputs[message.name][b : e + 1] = message.data
                 elif message.type == data.VariableType.kOutput:
                     flat_outputs[message.name][b : e + 1] = message.data
@@ -215,3 +368,97 @@ class DisciplineServer(disc.DisciplineService):
                     "Expected continuous variables but arrays were"
                     " empty for variable %s." % (message.name)
                 )
+
+        return transport
+
+    def cached_evaluation(self, kind, state, evaluate, result):
+        """
+        Runs an evaluation, unless its result is available from the cache.
+
+        The evaluation is identified by its kind (usually the RPC name), the
+        discipline class, the discipline options, the variable layout and the
+        received state vectors (see preallocate_inputs). If no cache is
+        attached to the server, the evaluation is always run.
+
+        Parameters
+        ----------
+        kind : string
+            name identifying the type of evaluation
+        state : dict
+            the contiguous state vectors of the received variables
+        evaluate : callable
+            function that runs the evaluation and fills result
+        result : dict or tuple
+            the dictionary (or tuple of dictionaries) filled by evaluate
+
+        Returns
+        -------
+        the (possibly cached) result
+        """
+        if self.cache is None:
+            evaluate()
+            return result
+
+        key = self.evaluation_key(kind, state)
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        evaluate()
+        self.cache_result(key, state, result)
+        return result
+
+    def evaluation_key(self, kind, state):
+        """
+        Returns the cache key of an evaluation (see cached_evaluation).
+        """
+        discipline = type(self._discipline)
+
+        return evaluation_digest(
+            kind,
+            discipline.__module__ + "." + discipline.__qualname__,
+            self._options.SerializeToString(deterministic=True),
+            self.get_layout().digest(),
+            *[state[var_type] for var_type in sorted(state)],
+        )
+
+    def cache_result(self, key, state, result):
+        """
+        Stores the result of an evaluation (and its inputs) in the cache.
+        """
+        inputs = np.concatenate([state[var_type] for var_type in sorted(state)])
+        self.cache.put(key, result, inputs=inputs)
+
+    def shared_messages(self, shared, arrays, var_type, partials=None):
+        """
+        Responds to a client that uses the shared memory transport.
+
+        The results are written to the shared buffers of the client and a
+        single "buffers ready" chunk is sent to the client.
+        """
+        if arrays is not None:
+            shared.write(var_type, arrays)
+        if partials is not None:
+            shared.write(data.kPartial, partials)
+
+        yield PackedArray(name=SHARED_MEMORY_NAME, type=var_type)
+
+    def state_messages(self, arrays, var_type):
+        """
+        Generates the chunks of the contiguous state vector of a variable
+        type.
+
+        This is used to respond to clients that transmitted their variables
+        as a state vector.
+        """
+        vector = self.get_layout().pack(var_type, arrays)
+
+        for b, e in get_chunk_indices(vector.size, self._stream_opts.num_double):
+            yield PackedArray(
+                name=STATE_VECTOR_NAME,
+                type=var_type,
+                start=b,
+                end=e - 1,
+                data=vector[b:e],
+            )
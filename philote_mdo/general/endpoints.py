@@ -0,0 +1,149 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import os
+import socket
+import stat
+import tempfile
+import grpc
+
+
+# host names that refer to the local machine
+_LOCAL_HOSTS = ("localhost", "127.0.0.1", "::1", "[::1]", "0.0.0.0", "[::]", "")
+
+
+def get_uds_path(port):
+    """
+    Returns the default Unix domain socket path of a discipline server.
+
+    Servers listening on a TCP port also listen on this socket, so that local
+    clients can find it from the port alone.
+    """
+    return os.path.join(tempfile.gettempdir(), "philote-{}.sock".format(port))
+
+
+def add_endpoints(server, port="50051", uds=True, uds_path=None):
+    """
+    Adds the TCP and Unix domain socket endpoints to a gRPC server.
+
+    Parameters
+    ----------
+    server : grpc.Server
+        the gRPC server (before it is started)
+    port : string
+        the TCP port (no TCP endpoint is added, if None)
+    uds : bool
+        whether to listen on a Unix domain socket as well
+    uds_path : string
+        path of the socket (by default, derived from the port)
+
+    Returns
+    -------
+    list of the endpoint addresses
+    """
+    addresses = []
+
+    if port is not None:
+        server.add_insecure_port("[::]:{}".format(port))
+        addresses.append("[::]:{}".format(port))
+
+    if uds and hasattr(socket, "AF_UNIX"):
+        if uds_path is None:
+            if port is None:
+                raise ValueError("A socket path is required if no port is given.")
+            uds_path = get_uds_path(port)
+
+        server.add_insecure_port("unix:" + uds_path)
+        addresses.append("unix:" + uds_path)
+
+    return addresses
+
+
+def _is_local_host(host):
+    """
+    Checks if a host name refers to the local machine.
+    """
+    if host in _LOCAL_HOSTS:
+        return True
+
+    return host in (socket.gethostname(), socket.getfqdn())
+
+
+def _is_listening(path):
+    """
+    Checks if a server accepts connections on a Unix domain socket.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return False
+    except OSError:
+        return False
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(path)
+        return True
+    except OSError:
+        return False
+    finally:
+        sock.close()
+
+
+def resolve_address(address):
+    """
+    Returns the endpoint used to connect to a discipline address.
+
+    If the address (host:port) refers to the local machine and a server
+    listens on the default Unix domain socket of the port, the socket is
+    used instead of TCP. Other addresses (including explicit 'unix:'
+    addresses) are returned unchanged.
+    """
+    if address.startswith("unix:") or not hasattr(socket, "AF_UNIX"):
+        return address
+
+    host, _, port = address.rpartition(":")
+    if not port or not _is_local_host(host):
+        return address
+
+    path = get_uds_path(port)
+    if _is_listening(path):
+        return "unix:" + path
+
+    return address
+
+
+def create_channel(address, options=None):
+    """
+    Creates an insecure channel to a discipline server.
+
+    Local servers are automatically reached through their Unix domain
+    socket (see resolve_address), which avoids the overhead of the TCP
+    stack.
+    """
+    return grpc.insecure_channel(resolve_address(address), options=options)
@@ -28,7 +28,14 @@
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
 import grpc
+import numpy as np
 from philote_mdo.general.discipline_client import DisciplineClient
+from philote_mdo.general.array_rpc import (
+    EXPLICIT_SERVICE,
+    BATCH_SIZE_KEY,
+    ArrayStreamStub,
+)
+import philote_mdo.generated.data_pb2 as data
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 
 
@@ -40,6 +47,29 @@ class ExplicitClient(DisciplineClient):
     def __init__(self, channel):
         super().__init__(channel)
         self._expl_stub = disc.ExplicitServiceStub(channel)
+        self._expl_packed_stub = ArrayStreamStub(
+            channel,
+            EXPLICIT_SERVICE,
+            (
+                "ComputeFunction",
+                "ComputeGradient",
+                "ComputeFunctionAndGradient",
+                "ComputeFunctionBatch",
+                "ComputeGradientBatch",
+            ),
+        )
+
+        # optional RPCs that the server does not implement (these are
+        # emulated with the standard RPCs)
+        self._unimplemented = set()
+
+    def _explicit_stub(self):
+        """
+        Returns the stub matching the array encoding of this client.
+        """
+        if self.packed_arrays:
+            return self._expl_packed_stub
+        return self._expl_stub
 
     def run_compute(self, inputs):
         """
@@ -47,7 +77,7 @@ class ExplicitClient(DisciplineClient):
         for a set of inputs (sent to the server).
         """
         messages = self._assemble_input_messages(inputs)
-        responses = self._expl_stub.ComputeFunction(iter(messages))
+        responses = self._explicit_stub().ComputeFunction(messages)
         outputs = self._recover_outputs(responses)
 
         return outputs
@@ -58,7 +88,114 @@ class ExplicitClient(DisciplineClient):
         for a set of inputs (sent to the server).
         """
         messages = self._assemble_input_messages(inputs)
-        responses = self._expl_stub.ComputeGradient(iter(messages))
+        responses = self._explicit_stub().ComputeGradient(messages)
         partials = self._recover_partials(responses)
 
         return partials
+
+    def run_compute_with_partials(self, inputs):
+        """
+        Requests and receives the function and gradient evaluation from the
+        analysis server with a single RPC (the inputs are only sent once).
+
+        Returns the outputs and the partials. If the server does not implement
+        this RPC, the function and gradient are requested separately.
+        """
+        if "ComputeFunctionAndGradient" not in self._unimplemented:
+            messages = self._assemble_input_messages(inputs)
+            try:
+                responses = self._expl_packed_stub.ComputeFunctionAndGradient(messages)
+                return self._recover_outputs_and_partials(responses)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeFunctionAndGradient")
+
+        return self.run_compute(inputs), self.run_compute_partials(inputs)
+
+    def run_compute_batch(self, inputs):
+        """
+        Requests and receives the function evaluations for a batch of points
+        from the analysis server.
+
+        All inputs (and the returned outputs) have a leading batch axis. The
+        points are evaluated with a single RPC. If the server does not
+        implement batch evaluations, the points are evaluated one by one.
+        """
+        num_points = _get_num_points(inputs)
+
+        if "ComputeFunctionBatch" not in self._unimplemented:
+            messages = self._assemble_batch_messages(inputs)
+            try:
+                responses = self._expl_packed_stub.ComputeFunctionBatch(
+                    messages, metadata=((BATCH_SIZE_KEY, str(num_points)),)
+                )
+                return self._recover_outputs(responses, num_points)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeFunctionBatch")
+
+        _, outputs, _ = self.get_layout().allocate_batch(data.kOutput, num_points)
+        for i in range(num_points):
+            point = self.run_compute({name: val[i] for name, val in inputs.items()})
+            for name, value in point.items():
+                outputs[name][i] = value
+
+        return outputs
+
+    def run_compute_partials_batch(self, inputs):
+        """
+        Requests and receives the gradient evaluations for a batch of points
+        from the analysis server.
+
+        All inputs (and the returned partials) have a leading batch axis. If
+        the server does not implement batch evaluations, the points are
+        evaluated one by one.
+        """
+        num_points = _get_num_points(inputs)
+
+        if "ComputeGradientBatch" not in self._unimplemented:
+            messages = self._assemble_batch_messages(inputs)
+            try:
+                responses = self._expl_packed_stub.ComputeGradientBatch(
+                    messages, metadata=((BATCH_SIZE_KEY, str(num_points)),)
+                )
+                return self._recover_partials(responses, num_points)
+            except grpc.RpcError as error:
+                self._check_unimplemented(error, "ComputeGradientBatch")
+
+        _, partials, _ = self.get_layout().allocate_partials_batch(num_points)
+        for i in range(num_points):
+            point = self.run_compute_partials(
+                {name: val[i] for name, val in inputs.items()}
+            )
+            for pair, value in point.items():
+                partials[pair][i] = value
+
+        return partials
+
+    def _check_unimplemented(self, error, method):
+        """
+        Handles the error of an optional RPC. If the server does not implement
+        the RPC, it is not called again. Other errors are raised.
+        """
+        if error.code() != grpc.StatusCode.UNIMPLEMENTED:
+            raise error
+
+        self._unimplemented.add(method)
+
+    def _assemble_batch_messages(self, inputs):
+        """
+        Lazily assembles the messages for a batch of input points.
+
+        The state vector transport is not used for batches, as every variable
+        already is one contiguous block of all points.
+        """
+        return self._assemble_array_messages(inputs, data.VariableType.kInput)
+
+
+def _get_num_points(inputs):
+    """
+    Returns the number of points of a batch of inputs.
+    """
+    for value in inputs.values():
+        return np.shape(value)[0]
+
+    raise ValueError("A batch evaluation requires at least one input.")
@@ -28,6 +28,7 @@
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
 import philote_mdo.general as pmdo
+from philote_mdo.utils import PairDict
 
 
 class ExplicitDiscipline(pmdo.Discipline):
@@ -43,3 +44,61 @@ class ExplicitDiscipline(pmdo.Discipline):
 
     def compute_partials(self, inputs, partials):
         raise NotImplementedError("compute_partials not implemented")
+
+    def compute_with_partials(self, inputs, outputs, partials):
+        """
+        Computes the function and gradient evaluation at the same point.
+
+        The default implementation calls compute and compute_partials.
+        Disciplines that can share intermediate results between the function
+        and gradient evaluation should override this function.
+        """
+        self.compute(inputs, outputs)
+        self.compute_partials(inputs, partials)
+
+    def compute_batch(self, inputs, outputs):
+        """
+        Computes the function evaluation for a batch of points.
+
+        All inputs and outputs have a leading batch axis. The default
+        implementation calls compute for every point. Disciplines that can
+        evaluate all points at once (e.g., using NumPy vectorization) should
+        override this function.
+        """
+        for i in range(_get_num_points(inputs, outputs)):
+            point_inputs = {name: value[i] for name, value in inputs.items()}
+            point_outputs = {name: value[i] for name, value in outputs.items()}
+            self.compute(point_inputs, point_outputs)
+
+            for name, value in point_outputs.items():
+                outputs[name][i] = value
+
+    def compute_partials_batch(self, inputs, partials):
+        """
+        Computes the gradient evaluation for a batch of points.
+
+        All inputs and partials have a leading batch axis. The default
+        implementation calls compute_partials for every point.
+        """
+        for i in range(_get_num_points(inputs, partials)):
+            point_partials = PairDict()
+            for pair, value in partials.items():
+                point_partials[pair] = value[i]
+
+            self.compute_partials(
+                {name: value[i] for name, value in inputs.items()}, point_partials
+            )
+
+            for pair, value in point_partials.items():
+                partials[pair][i] = value
+
+
+def _get_num_points(*batches):
+    """
+    Returns the length of the leading batch axis of the first available array.
+    """
+    for batch in batches:
+        for value in batch.values():
+            return value.shape[0]
+
+    return 0
@@ -30,7 +30,18 @@
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 import philote_mdo.generated.data_pb2 as data
 from philote_mdo.general.discipline_server import DisciplineServer
-from philote_mdo.utils import get_chunk_indices
+from philote_mdo.general.array_rpc import (
+    EXPLICIT_SERVICE,
+    BATCH_SIZE_KEY,
+    add_array_stream_handlers,
+    get_metadata_value,
+)
+from philote_mdo.utils import (
+    PackedArray,
+    get_chunk_indices,
+    STATE_VECTOR_NAME,
+    SharedBuffers,
+)
 
 
 class ExplicitServer(DisciplineServer, disc.ExplicitServiceServicer):
@@ -46,7 +57,20 @@ class ExplicitServer(DisciplineServer, disc.ExplicitServiceServicer):
         Attaches this discipline server class to a gRPC server.
         """
         super().attach_to_server(server)
-        disc.add_ExplicitServiceServicer_to_server(self, server)
+
+        # the array RPCs are registered with the packed array codec, which is
+        # wire compatible with the generated data.Array (de)serializers
+        add_array_stream_handlers(
+            server,
+            EXPLICIT_SERVICE,
+            {
+                "ComputeFunction": self.ComputeFunction,
+                "ComputeGradient": self.ComputeGradient,
+                "ComputeFunctionAndGradient": self.ComputeFunctionAndGradient,
+                "ComputeFunctionBatch": self.ComputeFunctionBatch,
+                "ComputeGradientBatch": self.ComputeGradientBatch,
+            },
+        )
 
     def ComputeFunction(self, request_iterator, context):
         """
@@ -56,14 +80,121 @@ class ExplicitServer(DisciplineServer, disc.ExplicitServiceServicer):
         flat_inputs = {}
         outputs = {}
 
-        self.preallocate_inputs(inputs, flat_inputs)
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        self.get_allocator().allocate(data.kOutput, outputs)
+        transport = self.process_inputs(request_iterator, flat_inputs, state=state)
+        outputs = self.cached_evaluation(
+            "ComputeFunction",
+            state,
+            lambda: self._discipline.compute(inputs, outputs),
+            outputs,
+        )
+
+        yield from self._respond(transport, outputs)
+
+    def ComputeGradient(self, request_iterator, context):
+        """
+        Computes the gradient evaluation and sends the result to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        jac = self.preallocate_partials()
+        transport = self.process_inputs(request_iterator, flat_inputs, state=state)
+        jac = self.cached_evaluation(
+            "ComputeGradient",
+            state,
+            lambda: self._discipline.compute_partials(inputs, jac),
+            jac,
+        )
+
+        yield from self._respond(transport, partials=jac)
+
+    def ComputeFunctionAndGradient(self, request_iterator, context):
+        """
+        Computes the function and gradient evaluation for one set of inputs
+        and sends both results to the client.
+        """
+        inputs = {}
+        flat_inputs = {}
+        outputs = {}
+
+        state = self.preallocate_inputs(inputs, flat_inputs)
+        self.get_allocator().allocate(data.kOutput, outputs)
+        jac = self.preallocate_partials()
+        transport = self.process_inputs(request_iterator, flat_inputs, state=state)
+        outputs, jac = self.cached_evaluation(
+            "ComputeFunctionAndGradient",
+            state,
+            lambda: self._discipline.compute_with_partials(inputs, outputs, jac),
+            (outputs, jac),
+        )
+
+        yield from self._respond(transport, outputs, jac)
+
+    def ComputeFunctionBatch(self, request_iterator, context):
+        """
+        Computes the function evaluation for a batch of points and sends the
+        results to the client.
+
+        The number of points is transmitted as invocation metadata. The
+        array chunks of every variable index into the concatenation of all
+        points.
+        """
+        num_points = int(get_metadata_value(context, BATCH_SIZE_KEY, 1))
+        layout = self.get_layout()
+
+        _, inputs, flat_inputs = layout.allocate_batch(data.kInput, num_points)
+        _, outputs, _ = layout.allocate_batch(data.kOutput, num_points)
+        self.process_inputs(request_iterator, flat_inputs)
+        self._discipline.compute_batch(inputs, outputs)
+
+        yield from self._output_messages(outputs)
+
+    def ComputeGradientBatch(self, request_iterator, context):
+        """
+        Computes the gradient evaluation for a batch of points and sends the
+        results to the client.
+        """
+        num_points = int(get_metadata_value(context, BATCH_SIZE_KEY, 1))
+        layout = self.get_layout()
+
+        _, inputs, flat_inputs = layout.allocate_batch(data.kInput, num_points)
+        _, jac, _ = layout.allocate_partials_batch(num_points)
         self.process_inputs(request_iterator, flat_inputs)
-        self._discipline.compute(inputs, outputs)
+        self._discipline.compute_partials_batch(inputs, jac)
+
+        yield from self._partials_messages(jac)
+
+    def _respond(self, transport, outputs=None, partials=None):
+        """
+        Generates the response messages for the outputs and/or partials.
+
+        The outputs are sent in the same format the inputs were transmitted
+        in (see process_inputs).
+        """
+        if isinstance(transport, SharedBuffers):
+            var_type = data.kOutput if outputs is not None else data.kPartial
+            yield from self.shared_messages(transport, outputs, var_type, partials)
+            return
 
+        if outputs is not None:
+            if transport == STATE_VECTOR_NAME:
+                yield from self.state_messages(outputs, data.kOutput)
+            else:
+                yield from self._output_messages(outputs)
+
+        if partials is not None:
+            yield from self._partials_messages(partials)
+
+    def _output_messages(self, outputs):
+        """
+        Generates the array chunks for transmitting the outputs.
+        """
         for output_name, value in outputs.items():
             # iterate through all chunks needed for the current output
             for b, e in get_chunk_indices(value.size, self._stream_opts.num_double):
-                yield data.Array(
+                yield PackedArray(
                     name=output_name,
                     type=data.kOutput,
                     start=b,
@@ -71,21 +202,14 @@ class ExplicitServer(DisciplineServer, disc.ExplicitServiceServicer):
                     data=value.ravel()[b:e],
                 )
 
-    def ComputeGradient(self, request_iterator, context):
+    def _partials_messages(self, jac):
         """
-        Computes the gradient evaluation and sends the result to the client.
+        Generates the array chunks for transmitting the partials.
         """
-        inputs = {}
-        flat_inputs = {}
-        self.preallocate_inputs(inputs, flat_inputs)
-        jac = self.preallocate_partials()
-        self.process_inputs(request_iterator, flat_inputs)
-        self._discipline.compute_partials(inputs, jac)
-
         for jac, value in jac.items():
             # iterate through all chunks needed for the current partials
             for b, e in get_chunk_indices(value.size, self._stream_opts.num_double):
-                yield data.Array(
+                yield PackedArray(
                     name=jac[0],
                     subname=jac[1],
                     type=data.kPartial,
@@ -29,6 +29,7 @@
 # control over the information you may find at these locations.
 import grpc
 from philote_mdo.general.discipline_client import DisciplineClient
+from philote_mdo.general.array_rpc import IMPLICIT_SERVICE, ArrayStreamStub
 import philote_mdo.generated.data_pb2 as data
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 
@@ -41,6 +42,19 @@ class ImplicitClient(DisciplineClient):
     def __init__(self, channel):
         super().__init__(channel=channel)
         self._impl_stub = disc.ImplicitServiceStub(channel)
+        self._impl_packed_stub = ArrayStreamStub(
+            channel,
+            IMPLICIT_SERVICE,
+            ("ComputeResiduals", "SolveResiduals", "ComputeResidualGradients"),
+        )
+
+    def _implicit_stub(self):
+        """
+        Returns the stub matching the array encoding of this client.
+        """
+        if self.packed_arrays:
+            return self._impl_packed_stub
+        return self._impl_stub
 
     def run_compute_residuals(self, inputs, outputs):
         """
@@ -48,7 +62,7 @@ class ImplicitClient(DisciplineClient):
         for a set of inputs and outputs (sent to the server).
         """
         messages = self._assemble_input_messages(inputs, outputs)
-        responses = self._impl_stub.ComputeResiduals(iter(messages))
+        responses = self._implicit_stub().ComputeResiduals(messages)
         residuals = self._recover_residuals(responses)
 
         return residuals
@@ -59,7 +73,7 @@ class ImplicitClient(DisciplineClient):
         discipline server.
         """
         messages = self._assemble_input_messages(inputs)
-        responses = self._impl_stub.SolveResiduals(iter(messages))
+        responses = self._implicit_stub().SolveResiduals(messages)
         outputs = self._recover_outputs(responses)
         return outputs
 
@@ -68,6 +82,6 @@ class ImplicitClient(DisciplineClient):
         Calls the RPC to compute the gradients of the residual equations.
         """
         messages = self._assemble_input_messages(inputs, outputs)
-        responses = self._impl_stub.ComputeResidualGradients(iter(messages))
+        responses = self._implicit_stub().ComputeResidualGradients(messages)
         partials = self._recover_partials(responses)
         return partials
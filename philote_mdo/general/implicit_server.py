@@ -30,7 +30,13 @@
 import philote_mdo.generated.disciplines_pb2_grpc as disc
 import philote_mdo.generated.data_pb2 as data
 import philote_mdo.general as pmdo
-from philote_mdo.utils import get_chunk_indices
+from philote_mdo.general.array_rpc import IMPLICIT_SERVICE, add_array_stream_handlers
+from philote_mdo.utils import (
+    PackedArray,
+    get_chunk_indices,
+    STATE_VECTOR_NAME,
+    SharedBuffers,
+)
 
 
 class ImplicitServer(pmdo.DisciplineServer, disc.ImplicitServiceServicer):
@@ -46,7 +52,18 @@ class ImplicitServer(pmdo.DisciplineServer, disc.ImplicitServiceServicer):
         Attaches this discipline server class to a gRPC server.
         """
         super().attach_to_server(server)
-        disc.add_ImplicitServiceServicer_to_server(self, server)
+
+        # the array RPCs are registered with the packed array codec, which is
+        # wire compatible with the generated data.Array (de)serializers
+        add_array_stream_handlers(
+            server,
+            IMPLICIT_SERVICE,
+            {
+                "ComputeResiduals": self.ComputeResiduals,
+                "SolveResiduals": self.SolveResiduals,
+                "ComputeResidualGradients": self.ComputeResidualGradients,
+            },
+        )
 
     def ComputeResiduals(self, request_iterator, context):
         """
@@ -59,21 +76,21 @@ class ImplicitServer(pmdo.DisciplineServer, disc.ImplicitServiceServicer):
         flat_outputs = {}
         residuals = {}
 
-        self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
-        self.process_inputs(request_iterator, flat_inputs, flat_outputs)
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        self.get_allocator().allocate(data.kResidual, residuals)
+        transport = self.process_inputs(
+            request_iterator, flat_inputs, flat_outputs, state
+        )
 
         # call the user-defined compute_residuals function
-        self._discipline.compute_residuals(inputs, outputs, residuals)
+        residuals = self.cached_evaluation(
+            "ComputeResiduals",
+            state,
+            lambda: self._discipline.compute_residuals(inputs, outputs, residuals),
+            residuals,
+        )
 
-        for res_name, value in residuals.items():
-            for b, e in get_chunk_indices(value.size, self._stream_opts.num_double):
-                yield data.Array(
-                    name=res_name,
-                    start=b,
-                    end=e,
-                    type=data.kResidual,
-                    data=value.ravel()[b:e],
-                )
+        yield from self._respond(transport, residuals, data.kResidual)
 
     def SolveResiduals(self, request_iterator, context):
         """
@@ -85,21 +102,20 @@ class ImplicitServer(pmdo.DisciplineServer, disc.ImplicitServiceServicer):
         outputs = {}
         flat_outputs = {}
 
-        self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
-        self.process_inputs(request_iterator, flat_inputs, flat_outputs)
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        transport = self.process_inputs(
+            request_iterator, flat_inputs, flat_outputs, state
+        )
 
         # call the user-defined solve function
-        self._discipline.solve_residuals(inputs, outputs)
+        outputs = self.cached_evaluation(
+            "SolveResiduals",
+            state,
+            lambda: self._discipline.solve_residuals(inputs, outputs),
+            outputs,
+        )
 
-        for output_name, value in outputs.items():
-            for b, e in get_chunk_indices(value.size, self._stream_opts.num_double):
-                yield data.Array(
-                    name=output_name,
-                    start=b,
-                    end=e,
-                    type=data.kOutput,
-                    data=value.ravel()[b:e],
-                )
+        yield from self._respond(transport, outputs, data.kOutput)
 
     def ComputeResidualGradients(self, request_iterator, context):
         """
@@ -111,23 +127,60 @@ class ImplicitServer(pmdo.DisciplineServer, disc.ImplicitServiceServicer):
         outputs = {}
         flat_outputs = {}
 
-        self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
+        state = self.preallocate_inputs(inputs, flat_inputs, outputs, flat_outputs)
         jac = self.preallocate_partials()
-        self.process_inputs(request_iterator, flat_inputs, flat_outputs)
+        transport = self.process_inputs(
+            request_iterator, flat_inputs, flat_outputs, state
+        )
 
         # call the user-defined residual partials function
-        self._discipline.residual_partials(inputs, outputs, jac)
+        jac = self.cached_evaluation(
+            "ComputeResidualGradients",
+            state,
+            lambda: self._discipline.residual_partials(inputs, outputs, jac),
+            jac,
+        )
+
+        yield from self._respond(transport, jac, data.kPartial)
 
-        for jac, value in jac.items():
+    def _respond(self, transport, arrays, var_type):
+        """
+        Generates the response messages for the residuals, outputs or
+        partials.
+
+        The variables are sent in the same format the inputs were transmitted
+        in (see process_inputs).
+        """
+        if isinstance(transport, SharedBuffers):
+            if var_type == data.kPartial:
+                yield from self.shared_messages(transport, None, var_type, arrays)
+            else:
+                yield from self.shared_messages(transport, arrays, var_type)
+            return
+
+        if transport == STATE_VECTOR_NAME and var_type != data.kPartial:
+            yield from self.state_messages(arrays, var_type)
+            return
+
+        for name, value in arrays.items():
             for b, e in get_chunk_indices(value.size, self._stream_opts.num_double):
-                yield data.Array(
-                    name=jac[0],
-                    subname=jac[1],
-                    type=data.kPartial,
-                    start=b,
-                    end=e,
-                    data=value.ravel()[b:e],
-                )
+                if var_type == data.kPartial:
+                    yield PackedArray(
+                        name=name[0],
+                        subname=name[1],
+                        type=var_type,
+                        start=b,
+                        end=e,
+                        data=value.ravel()[b:e],
+                    )
+                else:
+                    yield PackedArray(
+                        name=name,
+                        start=b,
+                        end=e,
+                        type=var_type,
+                        data=value.ravel()[b:e],
+                    )
 
     # def MatrixFreeGradients(self, request_iterator, context):
     #     """
@@ -0,0 +1,357 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import multiprocessing
+import os
+import queue
+import threading
+import traceback
+
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.general.explicit_discipline import ExplicitDiscipline
+from philote_mdo.utils import SharedBuffers, VariableLayout
+
+
+# variable types of the arguments, transmitted inputs and results of the
+# discipline functions that are evaluated by the worker processes
+_SIGNATURES = {
+    "compute": (
+        (data.kInput, data.kOutput),
+        (data.kInput,),
+        (data.kOutput,),
+    ),
+    "compute_partials": (
+        (data.kInput, data.kPartial),
+        (data.kInput,),
+        (data.kPartial,),
+    ),
+    "compute_with_partials": (
+        (data.kInput, data.kOutput, data.kPartial),
+        (data.kInput,),
+        (data.kOutput, data.kPartial),
+    ),
+    "compute_residuals": (
+        (data.kInput, data.kOutput, data.kResidual),
+        (data.kInput, data.kOutput),
+        (data.kResidual,),
+    ),
+    "solve_residuals": (
+        (data.kInput, data.kOutput),
+        (data.kInput, data.kOutput),
+        (data.kOutput,),
+    ),
+    "residual_partials": (
+        (data.kInput, data.kOutput, data.kPartial),
+        (data.kInput, data.kOutput),
+        (data.kPartial,),
+    ),
+}
+
+
+def _worker_call(discipline, buffers, method):
+    """
+    Calls a discipline function on the shared buffers of a worker.
+    """
+    arg_types, _, result_types = _SIGNATURES[method]
+
+    args = []
+    for var_type in arg_types:
+        if var_type == data.kPartial:
+            args.append(buffers.allocate_partials()[1])
+        else:
+            args.append(buffers.allocate(var_type)[1])
+
+    getattr(discipline, method)(*args)
+
+    # the discipline may have replaced arrays instead of assigning in place
+    for var_type, arrays in zip(arg_types, args):
+        if var_type in result_types:
+            buffers.write(var_type, arrays)
+
+
+def _worker_main(connection, factory):
+    """
+    Main loop of a discipline worker process.
+
+    The worker owns one discipline instance and executes the commands it
+    receives from the pool. Variables are exchanged through shared memory
+    buffers, so that only the commands are sent through the pipe.
+    """
+    discipline = factory()
+    buffers = None
+
+    while True:
+        command, *args = connection.recv()
+
+        if command == "close":
+            break
+
+        try:
+            if command == "set_options":
+                discipline.set_options(args[0])
+            elif command == "setup":
+                discipline._clear_data()
+                discipline.setup()
+            elif command == "setup_partials":
+                discipline.setup_partials()
+            elif command == "attach":
+                if buffers is not None:
+                    buffers.close()
+                layout = VariableLayout(discipline._var_meta, discipline._partials_meta)
+                buffers = SharedBuffers.from_json(layout, args[0])
+            elif command == "call":
+                _worker_call(discipline, buffers, args[0])
+
+            connection.send(("ok",))
+        except Exception:
+            connection.send(("error", traceback.format_exc()))
+
+    if buffers is not None:
+        buffers.close()
+    connection.close()
+
+
+class _Worker:
+    """
+    Handle of a discipline worker process and its shared buffers.
+    """
+
+    def __init__(self, context, factory):
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_connection, factory), daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+        # shared memory buffers (owned by the pool process)
+        self.buffers = None
+
+    def request(self, *message):
+        """
+        Sends a command to the worker and waits for its completion.
+        """
+        self.connection.send(message)
+        reply = self.connection.recv()
+
+        if reply[0] == "error":
+            raise RuntimeError("Discipline worker process failed:\n" + reply[1])
+
+    def close(self):
+        """
+        Stops the worker process and releases its buffers.
+        """
+        try:
+            self.connection.send(("close",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join()
+        self.connection.close()
+
+        if self.buffers is not None:
+            self.buffers.close()
+            self.buffers = None
+
+
+class ProcessPoolDiscipline(ExplicitDiscipline):
+    """
+    Discipline that evaluates a discipline in a pool of worker processes.
+
+    Every worker process constructs its own discipline instance from the
+    factory (e.g., the discipline class), which must be picklable. Options
+    and setup calls are forwarded to all workers. Each evaluation checks out
+    an idle worker. This way, concurrent requests of a server run in
+    parallel on separate cores, even for pure Python disciplines that hold
+    the GIL. The variables are exchanged with the workers through shared
+    memory buffers that are sized from the variable layout.
+
+    Both explicit and implicit disciplines are supported. The pool is served
+    like any other discipline, e.g.:
+
+        ExplicitServer(discipline=ProcessPoolDiscipline(Paraboloid, 4))
+    """
+
+    def __init__(self, factory, num_workers=None, mp_context="spawn"):
+        # local instance that provides the metadata and options
+        self._factory = factory
+        self._local = factory()
+
+        super().__init__()
+        self._copy_properties()
+
+        if num_workers is None:
+            num_workers = os.cpu_count()
+
+        # worker processes and the queue of idle workers
+        context = multiprocessing.get_context(mp_context)
+        self._workers = [_Worker(context, factory) for _ in range(num_workers)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+
+        # layout of the shared buffers of the workers. the lock guards all
+        # operations that check out every worker (broadcasts and buffer
+        # allocation), so that concurrent callers never hold part of the pool
+        # each and wait for the rest
+        self._layout = None
+        self._lock = threading.Lock()
+
+    def _copy_properties(self):
+        """
+        Copies the properties and metadata of the local instance.
+        """
+        self._is_continuous = self._local._is_continuous
+        self._is_differentiable = self._local._is_differentiable
+        self._provides_gradients = self._local._provides_gradients
+        self._is_implicit = self._local._is_implicit
+        self._var_meta = self._local._var_meta
+        self._partials_meta = self._local._partials_meta
+
+    def _broadcast(self, *message):
+        """
+        Sends a command to all workers (once they are idle).
+        """
+        with self._lock:
+            workers = [self._idle.get() for _ in self._workers]
+            try:
+                for worker in workers:
+                    worker.request(*message)
+            finally:
+                for worker in workers:
+                    self._idle.put(worker)
+
+    def initialize(self):
+        self.options_list = dict(self._local.options_list)
+
+    def set_options(self, options):
+        self._local.set_options(options)
+        self._broadcast("set_options", options)
+
+    def setup(self):
+        self._local._clear_data()
+        self._local.setup()
+        self._broadcast("setup")
+        self._copy_properties()
+
+    def setup_partials(self):
+        self._local.setup_partials()
+        self._broadcast("setup_partials")
+        self._copy_properties()
+
+        # allocate the buffers before any evaluation checks out a worker
+        self._get_layout()
+
+    def _clear_data(self):
+        self._local._clear_data()
+        self._copy_properties()
+
+    def _get_layout(self):
+        """
+        Returns the layout of the shared buffers. The buffers of all workers
+        are (re)allocated if the metadata has changed.
+        """
+        layout = self._layout
+        if layout is not None and layout.matches(self._var_meta, self._partials_meta):
+            return layout
+
+        with self._lock:
+            # another thread may have allocated the buffers in the meantime
+            if self._layout is not None and self._layout.matches(
+                self._var_meta, self._partials_meta
+            ):
+                return self._layout
+
+            layout = VariableLayout(self._var_meta, self._partials_meta)
+
+            workers = [self._idle.get() for _ in self._workers]
+            try:
+                for worker in workers:
+                    if worker.buffers is not None:
+                        worker.buffers.close()
+                    worker.buffers = SharedBuffers(layout)
+                    worker.request("attach", worker.buffers.to_json())
+            finally:
+                for worker in workers:
+                    self._idle.put(worker)
+
+            self._layout = layout
+            return layout
+
+    def _call(self, method, *args):
+        """
+        Evaluates a discipline function on an idle worker.
+        """
+        arg_types, input_types, result_types = _SIGNATURES[method]
+        self._get_layout()
+
+        worker = self._idle.get()
+        try:
+            for var_type, arrays in zip(arg_types, args):
+                if var_type in input_types:
+                    worker.buffers.write(var_type, arrays)
+
+            worker.request("call", method)
+
+            for var_type, arrays in zip(arg_types, args):
+                if var_type in result_types:
+                    for name, value in worker.buffers.arrays(var_type).items():
+                        if name in arrays:
+                            arrays[name][...] = value
+                        else:
+                            arrays[name] = value.copy()
+        finally:
+            self._idle.put(worker)
+
+    def compute(self, inputs, outputs):
+        self._call("compute", inputs, outputs)
+
+    def compute_partials(self, inputs, partials):
+        self._call("compute_partials", inputs, partials)
+
+    def compute_with_partials(self, inputs, outputs, partials):
+        self._call("compute_with_partials", inputs, outputs, partials)
+
+    def compute_residuals(self, inputs, outputs, residuals):
+        self._call("compute_residuals", inputs, outputs, residuals)
+
+    def solve_residuals(self, inputs, outputs):
+        self._call("solve_residuals", inputs, outputs)
+
+    def residual_partials(self, inputs, outputs, partials):
+        self._call("residual_partials", inputs, outputs, partials)
+
+    def close(self):
+        """
+        Stops all worker processes and releases the shared memory buffers.
+        """
+        for worker in self._workers:
+            worker.close()
+
+        self._workers = []
+        self._layout = None
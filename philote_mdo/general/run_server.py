@@ -29,25 +29,26 @@
 # control over the information you may find at these locations.
 import grpc
 from concurrent import futures
-import philote_mdo.generated.explicit_pb2_grpc as explicit_pb2_grpc
-import philote_mdo.generated.implicit_pb2_grpc as implicit_pb2_grpc
+from philote_mdo.general.discipline_server import DisciplineServer
+from philote_mdo.general.endpoints import add_endpoints
 
 
-def run_server(service, port="50051", max_workers=10):
+def run_server(service, port="50051", max_workers=10, uds=True, uds_path=None):
     """
     Helper function for running an analysis server.
+
+    The server listens on the TCP port and (unless disabled) on a Unix
+    domain socket, which local clients select automatically.
     """
     server = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
 
     # add an explicit or implicit server
-    if isinstance(service, explicit_pb2_grpc.ExplicitDisciplineServicer):
-        explicit_pb2_grpc.add_ExplicitDisciplineServicer_to_server(service, server)
-    elif isinstance(service, implicit_pb2_grpc.ImplicitDisciplineServicer):
-        implicit_pb2_grpc.add_ImplicitDisciplineServicer_to_server(service, server)
+    if isinstance(service, DisciplineServer):
+        service.attach_to_server(server)
     else:
         raise ValueError("Unexpected object type provided for variable " '"service".')
 
-    server.add_insecure_port("[::]:" + port)
+    add_endpoints(server, port=port, uds=uds, uds_path=uds_path)
     server.start()
 
     server.wait_for_termination()
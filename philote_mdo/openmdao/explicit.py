@@ -31,6 +31,7 @@ import numpy as np
 import openmdao.api as om
 import philote_mdo.general as pm
 import philote_mdo.openmdao.utils as utils
+from philote_mdo.utils import PairDict
 
 
 class RemoteExplicitComponent(om.ExplicitComponent):
@@ -39,9 +40,28 @@ class RemoteExplicitComponent(om.ExplicitComponent):
     server.
     """
 
-    def __init__(self, channel=None, num_par_fd=1, **kwargs):
+    def __init__(
+        self,
+        channel=None,
+        num_par_fd=1,
+        fuse_partials=False,
+        cache_size=0,
+        shared_memory=False,
+        **kwargs
+    ):
         """
         Initialize the component and client.
+
+        If fuse_partials is set, compute requests the outputs and the partials
+        with a single RPC. The partials are then reused by compute_partials,
+        if it is called at the same point.
+
+        If cache_size is nonzero, the results of the last cache_size
+        evaluations are kept on the client. Evaluations at bit-identical
+        inputs are then answered without contacting the server.
+
+        If shared_memory is set, the variables are exchanged with a server on
+        the same machine through shared memory instead of gRPC messages.
         """
         if not channel:
             raise ValueError('No channel provided, the Philote client will not'
@@ -54,6 +74,17 @@ class RemoteExplicitComponent(om.ExplicitComponent):
         # available options on this discipline.
         self._client = pm.ExplicitClient(channel=channel)
 
+        # partials computed alongside the last function evaluation
+        self._fuse_partials = fuse_partials
+        self._fused_inputs = None
+        self._fused_partials = None
+
+        # client-side cache of the last evaluations
+        self.cache = utils.create_client_cache(cache_size)
+
+        # exchange the variables through shared memory (same machine only)
+        self._shared_memory = shared_memory
+
         # call the init function of the explicit component
         super().__init__(num_par_fd=1, **kwargs)
 
@@ -105,7 +136,28 @@ class RemoteExplicitComponent(om.ExplicitComponent):
         Compute the function evaluation.
         """
         local_inputs = utils.create_local_inputs(inputs, self._client._var_meta)
-        out = self._client.run_compute(local_inputs)
+
+        if self._fuse_partials:
+            out, jac = utils.memoized_evaluation(
+                self,
+                "compute_with_partials",
+                lambda: self._client.run_compute_with_partials(local_inputs),
+                local_inputs,
+            )
+            self._fused_inputs = utils.copy_local_inputs(local_inputs)
+
+            # reused client buffers are overwritten by the next call
+            if self._client.reuse_buffers and self.cache is None:
+                jac = PairDict((key, val.copy()) for key, val in jac.items())
+            self._fused_partials = jac
+        else:
+            out = utils.memoized_evaluation(
+                self,
+                "compute",
+                lambda: self._client.run_compute(local_inputs),
+                local_inputs,
+            )
+
         utils.assign_global_outputs(out, outputs)
 
     def compute_partials(self, inputs, partials, discrete_inputs=None, discrete_outputs=None):
@@ -113,5 +165,23 @@ class RemoteExplicitComponent(om.ExplicitComponent):
         Compute the gradient evaluation.
         """
         local_inputs = utils.create_local_inputs(inputs, self._client._var_meta)
-        jac = self._client.run_compute_partials(local_inputs)
+
+        if self._fused_partials is not None and utils.local_inputs_equal(
+            local_inputs, self._fused_inputs
+        ):
+            jac = self._fused_partials
+        else:
+            jac = utils.memoized_evaluation(
+                self,
+                "compute_partials",
+                lambda: self._client.run_compute_partials(local_inputs),
+                local_inputs,
+            )
+
         utils.assign_global_outputs(jac, partials)
+
+    def get_cache_statistics(self):
+        """
+        Returns the hits, misses and number of entries of the client cache.
+        """
+        return utils.cache_statistics(self)
@@ -38,9 +38,18 @@ class RemoteImplicitComponent(om.ImplicitComponent):
     An OpenMDAO component that acts as a client to an implicit analysis server.
     """
 
-    def __init__(self, channel=None, num_par_fd=1, **kwargs):
+    def __init__(
+        self, channel=None, num_par_fd=1, cache_size=0, shared_memory=False, **kwargs
+    ):
         """
         Initialize the component and client.
+
+        If cache_size is nonzero, the results of the last cache_size
+        evaluations are kept on the client. Evaluations at bit-identical
+        inputs and outputs are then answered without contacting the server.
+
+        If shared_memory is set, the variables are exchanged with a server on
+        the same machine through shared memory instead of gRPC messages.
         """
         if not channel:
             raise ValueError('No channel provided, the Philote client will not'
@@ -53,6 +62,12 @@ class RemoteImplicitComponent(om.ImplicitComponent):
         # available options on this discipline.
         self._client = pm.ImplicitClient(channel=channel)
 
+        # client-side cache of the last evaluations
+        self.cache = utils.create_client_cache(cache_size)
+
+        # exchange the variables through shared memory (same machine only)
+        self._shared_memory = shared_memory
+
         # call the init function of the explicit component
         super().__init__(num_par_fd=1, **kwargs)
 
@@ -106,9 +121,21 @@ class RemoteImplicitComponent(om.ImplicitComponent):
         local_inputs = utils.create_local_inputs(inputs, self._client._var_meta)
         local_outputs = utils.create_local_inputs(outputs, self._client._var_meta, data.kOutput)
 
-        res = self._client.run_compute_residuals(local_inputs, local_outputs)
+        res = utils.memoized_evaluation(
+            self,
+            "apply_nonlinear",
+            lambda: self._client.run_compute_residuals(local_inputs, local_outputs),
+            local_inputs,
+            local_outputs,
+        )
         utils.assign_global_outputs(res, residuals)
 
+    def get_cache_statistics(self):
+        """
+        Returns the hits, misses and number of entries of the client cache.
+        """
+        return utils.cache_statistics(self)
+
     # def solve_nonlinear(self, inputs, outputs):
     #     """
     #     Solves the residual for the implicit discipline.
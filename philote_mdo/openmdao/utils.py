@@ -27,7 +27,9 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import numpy as np
 import philote_mdo.generated.data_pb2 as data
+from philote_mdo.utils import EvaluationCache, evaluation_digest
 
 
 def update_options():
@@ -45,6 +47,10 @@ def client_setup(comp):
     comp._client.run_setup()
     comp._client.get_variable_definitions()
 
+    # memoized results may not match the new variable definitions
+    if comp.cache is not None:
+        comp.cache.clear()
+
     # define inputs and outputs based on the discipline metadata
     for var in comp._client._var_meta:
         if not var.units:
@@ -73,6 +79,10 @@ def client_setup_partials(comp):
     for partial in comp._client._partials_meta:
         comp.declare_partials(partial.name, partial.subname)
 
+    # the shared memory segments are sized from the complete metadata
+    if comp._shared_memory:
+        comp._client.enable_shared_memory()
+
 
 def create_local_inputs(inputs, var_meta, type=data.kInput):
     """
@@ -91,6 +101,87 @@ def create_local_inputs(inputs, var_meta, type=data.kInput):
     return local
 
 
+def copy_local_inputs(local):
+    """
+    Creates a copy of a local inputs dictionary.
+
+    The local dictionary holds views of the OpenMDAO vectors, which are
+    modified in place by OpenMDAO.
+    """
+    return {key: np.array(val, copy=True) for key, val in local.items()}
+
+
+def local_inputs_equal(local, other):
+    """
+    Checks if two local inputs dictionaries hold bit-identical values.
+    """
+    if other is None or local.keys() != other.keys():
+        return False
+
+    return all(np.array_equal(local[key], other[key]) for key in local)
+
+
+def create_client_cache(cache_size):
+    """
+    Creates the client-side cache of an OpenMDAO component.
+
+    The cache holds the results of the last cache_size evaluations. If
+    cache_size is zero, no cache is created.
+    """
+    if not cache_size:
+        return None
+
+    return EvaluationCache(max_entries=cache_size)
+
+
+def local_inputs_digest(kind, *local):
+    """
+    Computes the digest of one or more local inputs dictionaries.
+    """
+    parts = [kind]
+    for variables in local:
+        for name in sorted(variables):
+            parts += [name, np.asarray(variables[name], dtype=float)]
+
+    return evaluation_digest(*parts)
+
+
+def memoized_evaluation(comp, kind, evaluate, *local):
+    """
+    Runs a remote evaluation, unless its result is available from the client
+    cache of the component.
+
+    The result is looked up by the evaluation kind and a digest of the local
+    inputs (and outputs) dictionaries. On a cache miss, evaluate is called
+    without arguments and its result is stored.
+    """
+    if comp.cache is None:
+        return evaluate()
+
+    key = local_inputs_digest(kind, *local)
+
+    result = comp.cache.get(key)
+    if result is None:
+        result = evaluate()
+        comp.cache.put(key, result)
+
+    return result
+
+
+def cache_statistics(comp):
+    """
+    Returns the hit/miss statistics of the client cache of a component.
+    """
+    if comp.cache is None:
+        return {"hits": 0, "misses": 0, "entries": 0}
+
+    return {
+        "hits": comp.cache.hits,
+        "misses": comp.cache.misses,
+        "entries": len(comp.cache),
+    }
+
+
 def assign_global_outputs(out, outputs):
     """
     Assigns a OpenMDAO outputs from a Philote-Python output/residual dictionary.
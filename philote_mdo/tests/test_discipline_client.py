@@ -27,6 +27,7 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import types
 import unittest
 from unittest.mock import Mock, MagicMock, patch
 import numpy as np
@@ -273,6 +274,10 @@ class TestDisciplineClient(unittest.TestCase):
 
         messages = client._assemble_input_messages(input_data, output_data)
 
+        # messages are generated lazily
+        self.assertIsInstance(messages, types.GeneratorType)
+        messages = list(messages)
+
         # check that the resulting messages match the expected messages
         self.assertEqual(len(messages), len(expected_messages))
         for msg, expected_msg in zip(messages, expected_messages):
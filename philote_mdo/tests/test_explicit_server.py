@@ -27,6 +27,7 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import tempfile
 import unittest
 from unittest.mock import Mock
 
@@ -36,6 +37,8 @@ from scipy.optimize import rosen, rosen_der
 from google.protobuf.empty_pb2 import Empty
 
 from philote_mdo.general import ExplicitDiscipline, ExplicitServer
+from philote_mdo.general.array_rpc import BATCH_SIZE_KEY
+from philote_mdo.utils import EvaluationCache, EvaluationStore
 import philote_mdo.generated.data_pb2 as data
 
 
@@ -141,6 +144,104 @@ class TestExplicitServer(unittest.TestCase):
             np.array_equal(grad, np.array([-251.0, -499.0, 11105.0, 25007.0, -2950.0]))
         )
 
+    def test_compute_function_batch(self):
+        """
+        Tests the ComputeFunctionBatch RPC of the Explicit Server (using the
+        default implementation of compute_batch).
+        """
+        server = ExplicitServer()
+        discipline = server._discipline = ExplicitDiscipline()
+        server._stream_opts.num_double = 4
+        discipline.add_input("x", shape=(2,), units="")
+        discipline.add_output("f", shape=(1,), units="")
+        discipline.add_output("g", shape=(2,), units="")
+
+        context = Mock()
+        context.invocation_metadata.return_value = [(BATCH_SIZE_KEY, "3")]
+        request_iterator = [
+            data.Array(
+                start=0,
+                end=3,
+                data=[1.0, 2.0, 3.0, 4.0],
+                type=data.VariableType.kInput,
+                name="x",
+            ),
+            data.Array(
+                start=4, end=5, data=[5.0, 6.0], type=data.VariableType.kInput, name="x"
+            ),
+        ]
+
+        # mock function call
+        def compute(inputs, outputs):
+            outputs["f"] = np.sum(inputs["x"])
+            outputs["g"] = 2.0 * inputs["x"]
+
+        server._discipline.compute = compute
+
+        # call the function
+        responses = list(server.ComputeFunctionBatch(request_iterator, context))
+
+        f = np.concatenate([r.data for r in responses if r.name == "f"])
+        g = np.concatenate([r.data for r in responses if r.name == "g"])
+        np.testing.assert_array_equal(f, [3.0, 7.0, 11.0])
+        np.testing.assert_array_equal(g, [2.0, 4.0, 6.0, 8.0, 10.0, 12.0])
+
+    def test_compute_function_cache(self):
+        """
+        Tests that repeated ComputeFunction calls are served from the cache.
+        """
+        server = ExplicitServer()
+        discipline = server._discipline = ExplicitDiscipline()
+        server.cache = EvaluationCache()
+        discipline.add_input("x", shape=(2,), units="")
+        discipline.add_output("f", shape=(1,), units="")
+
+        compute = Mock(
+            side_effect=lambda inputs, outputs: outputs.update(
+                f=np.array([inputs["x"].sum()])
+            )
+        )
+        server._discipline.compute = compute
+
+        def request(x):
+            return [data.Array(start=0, end=1, data=x, type=data.kInput, name="x")]
+
+        for x in ([1.0, 2.0], [1.0, 2.0], [2.0, 2.0], [1.0, 2.0]):
+            responses = list(server.ComputeFunction(request(x), Mock()))
+            self.assertEqual(responses[0].data[0], sum(x))
+
+        self.assertEqual(compute.call_count, 2)
+        self.assertEqual(server.cache.hits, 2)
+        self.assertEqual(server.cache.misses, 2)
+
+    def test_compute_function_store(self):
+        """
+        Tests that a restarted server serves ComputeFunction calls from the
+        persistent evaluation store.
+        """
+        request = [data.Array(start=0, end=1, data=[1.0, 2.0], type=data.kInput, name="x")]
+
+        with tempfile.TemporaryDirectory() as path:
+            for num_calls in (1, 0):
+                server = ExplicitServer()
+                discipline = server._discipline = ExplicitDiscipline()
+                server.cache = EvaluationStore(path)
+                discipline.add_input("x", shape=(2,), units="")
+                discipline.add_output("f", shape=(1,), units="")
+
+                compute = Mock(
+                    side_effect=lambda inputs, outputs: outputs.update(
+                        f=np.array([inputs["x"].sum()])
+                    )
+                )
+                server._discipline.compute = compute
+
+                responses = list(server.ComputeFunction(request, Mock()))
+                self.assertEqual(responses[0].data[0], 3.0)
+                self.assertEqual(compute.call_count, num_calls)
+
+                server.cache.close()
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
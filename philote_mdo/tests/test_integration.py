@@ -27,12 +27,16 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import asyncio
 from concurrent import futures
 import unittest
 import grpc
 import numpy as np
 import philote_mdo.general as pmdo
-from philote_mdo.examples import Paraboloid, QuadradicImplicit
+import philote_mdo.generated.disciplines_pb2_grpc as disc
+from philote_mdo.general.array_rpc import EXPLICIT_SERVICE, add_array_stream_handlers
+from scipy.optimize import rosen, rosen_der
+from philote_mdo.examples import Paraboloid, QuadradicImplicit, Rosenbrock
 
 
 class IntegrationTests(unittest.TestCase):
@@ -111,6 +115,412 @@ class IntegrationTests(unittest.TestCase):
         # stop the server
         server.stop(0)
 
+    def test_paraboloid_packed_arrays(self):
+        """
+        Integration test for the Paraboloid discipline using packed arrays.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client.packed_arrays = True
+
+        # transfer the stream options to the server
+        client.send_stream_options()
+
+        # run setup
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        # define some inputs
+        inputs = {"x": np.array([1.0]), "y": np.array([2.0])}
+
+        # run a function and gradient evaluation
+        outputs = client.run_compute(inputs)
+        jac = client.run_compute_partials(inputs)
+
+        self.assertEqual(outputs["f_xy"][0], 39.0)
+        self.assertEqual(jac["f_xy", "x"][0], -2.0)
+        self.assertEqual(jac["f_xy", "y"][0], 13.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_paraboloid_reuse_buffers(self):
+        """
+        Integration test for the Paraboloid discipline with buffer reuse.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.reuse_buffers = True
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client.reuse_buffers = True
+
+        # transfer the stream options to the server
+        client.send_stream_options()
+
+        # run setup
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        # run repeated function evaluations
+        outputs = client.run_compute({"x": np.array([1.0]), "y": np.array([2.0])})
+        self.assertEqual(outputs["f_xy"][0], 39.0)
+
+        outputs = client.run_compute({"x": np.array([0.0]), "y": np.array([0.0])})
+        self.assertEqual(outputs["f_xy"][0], 22.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_paraboloid_shared_memory(self):
+        """
+        Integration test for the Paraboloid discipline, transmitting the
+        variables through shared memory.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+
+        # run setup and negotiate the shared memory transport
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+        client.enable_shared_memory()
+
+        for x in (1.0, 2.0):
+            inputs = {"x": np.array([x]), "y": np.array([2.0])}
+
+            outputs = client.run_compute(inputs)
+            jac = client.run_compute_partials(inputs)
+            fused_outputs, fused_jac = client.run_compute_with_partials(inputs)
+
+            f = (x - 3.0) ** 2 + 2.0 * x + 36.0 - 3.0
+            self.assertEqual(outputs["f_xy"][0], f)
+            self.assertEqual(fused_outputs["f_xy"][0], f)
+            self.assertEqual(jac[("f_xy", "x")][0], 2.0 * x - 4.0)
+            self.assertEqual(fused_jac[("f_xy", "y")][0], x + 12.0)
+
+        # back to regular arrays
+        client.disable_shared_memory()
+        self.assertEqual(discipline._shared, {})
+        outputs = client.run_compute({"x": np.array([1.0]), "y": np.array([2.0])})
+        self.assertEqual(outputs["f_xy"][0], 39.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_paraboloid_unix_socket(self):
+        """
+        Integration test for the Paraboloid discipline, connecting a local
+        client through the Unix domain socket of the server.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        addresses = pmdo.add_endpoints(server, port="50051")
+        server.start()
+
+        self.assertEqual(addresses[1], "unix:" + pmdo.get_uds_path("50051"))
+
+        # local addresses are resolved to the socket, remote ones are not
+        self.assertEqual(pmdo.resolve_address("localhost:50051"), addresses[1])
+        self.assertEqual(pmdo.resolve_address("example.com:50051"), "example.com:50051")
+
+        # client code
+        client = pmdo.ExplicitClient(channel=pmdo.create_channel("localhost:50051"))
+
+        # run setup
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        outputs = client.run_compute({"x": np.array([1.0]), "y": np.array([2.0])})
+        self.assertEqual(outputs["f_xy"][0], 39.0)
+
+        # stop the server
+        server.stop(0).wait()
+
+        # the socket is no longer used once the server stopped
+        self.assertEqual(pmdo.resolve_address("localhost:50051"), "localhost:50051")
+
+    def test_paraboloid_async_client(self):
+        """
+        Integration test for the Paraboloid discipline, running concurrent
+        evaluations with the asynchronous client.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        async def run_client():
+            async with grpc.aio.insecure_channel("localhost:50051") as channel:
+                client = pmdo.AsyncExplicitClient(channel=channel)
+                client.packed_arrays = True
+
+                await client.send_stream_options()
+                await client.run_setup()
+                await client.get_variable_definitions()
+                await client.get_partials_definitions()
+
+                points = [{"x": np.array([x]), "y": np.array([2.0])} for x in range(20)]
+                outputs = await asyncio.gather(*[client.run_compute(p) for p in points])
+                jac = await client.run_compute_partials(points[1])
+
+                return outputs, jac
+
+        outputs, jac = asyncio.run(run_client())
+
+        for x, out in enumerate(outputs):
+            self.assertEqual(out["f_xy"][0], (x - 3.0) ** 2 + 2.0 * x + 33.0)
+        self.assertEqual(jac[("f_xy", "x")][0], -2.0)
+        self.assertEqual(jac[("f_xy", "y")][0], 13.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_async_server(self):
+        """
+        Integration test for the asynchronous servers, serving a regular and
+        a coroutine based discipline.
+        """
+
+        class AsyncParaboloid(Paraboloid):
+            async def compute(self, inputs, outputs):
+                await asyncio.sleep(0.01)
+                super().compute(inputs, outputs)
+
+        async def run():
+            server = grpc.aio.server()
+            pmdo.AsyncExplicitServer(discipline=AsyncParaboloid()).attach_to_server(server)
+            server.add_insecure_port("[::]:50051")
+
+            implicit_server = grpc.aio.server()
+            pmdo.AsyncImplicitServer(discipline=QuadradicImplicit()).attach_to_server(
+                implicit_server
+            )
+            implicit_server.add_insecure_port("[::]:50052")
+
+            await server.start()
+            await implicit_server.start()
+
+            async with grpc.aio.insecure_channel("localhost:50051") as channel:
+                client = pmdo.AsyncExplicitClient(channel=channel)
+                await client.run_setup()
+                await client.get_variable_definitions()
+                await client.get_partials_definitions()
+
+                points = [{"x": np.array([x]), "y": np.array([2.0])} for x in range(10)]
+                outputs = await asyncio.gather(*[client.run_compute(p) for p in points])
+                jac = await client.run_compute_partials(points[1])
+
+            async with grpc.aio.insecure_channel("localhost:50052") as channel:
+                client = pmdo.AsyncImplicitClient(channel=channel)
+                await client.run_setup()
+                await client.get_variable_definitions()
+                await client.get_partials_definitions()
+
+                inputs = {"a": np.array([1.0]), "b": np.array([2.0]), "c": np.array([-2.0])}
+                residuals = await client.run_compute_residuals(inputs, {"x": np.array([4.0])})
+                solution = await client.run_solve_residuals(inputs)
+
+            await server.stop(0)
+            await implicit_server.stop(0)
+
+            return outputs, jac, residuals, solution
+
+        outputs, jac, residuals, solution = asyncio.run(run())
+
+        for x, out in enumerate(outputs):
+            self.assertEqual(out["f_xy"][0], (x - 3.0) ** 2 + 2.0 * x + 33.0)
+        self.assertEqual(jac[("f_xy", "x")][0], -2.0)
+        self.assertEqual(residuals["x"][0], 22.0)
+        self.assertAlmostEqual(solution["x"][0], 0.73205081, places=8)
+
+    def test_process_pool(self):
+        """
+        Integration test for disciplines evaluated by worker processes, with
+        concurrent client requests.
+        """
+        explicit = pmdo.ProcessPoolDiscipline(Paraboloid, num_workers=2)
+        implicit = pmdo.ProcessPoolDiscipline(QuadradicImplicit, num_workers=1)
+
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        pmdo.ExplicitServer(discipline=explicit).attach_to_server(server)
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        implicit_server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+        pmdo.ImplicitServer(discipline=implicit).attach_to_server(implicit_server)
+        implicit_server.add_insecure_port("[::]:50052")
+        implicit_server.start()
+
+        # explicit client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        points = [{"x": np.array([float(x)]), "y": np.array([2.0])} for x in range(8)]
+        with futures.ThreadPoolExecutor(max_workers=4) as executor:
+            outputs = list(executor.map(client.run_compute, points))
+
+        for x, out in enumerate(outputs):
+            self.assertEqual(out["f_xy"][0], (x - 3.0) ** 2 + 2.0 * x + 33.0)
+
+        jac = client.run_compute_partials(points[1])
+        self.assertEqual(jac[("f_xy", "x")][0], -2.0)
+        self.assertEqual(jac[("f_xy", "y")][0], 13.0)
+
+        # implicit client code
+        client = pmdo.ImplicitClient(channel=grpc.insecure_channel("localhost:50052"))
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        inputs = {"a": np.array([1.0]), "b": np.array([2.0]), "c": np.array([-2.0])}
+        residuals = client.run_compute_residuals(inputs, {"x": np.array([4.0])})
+        self.assertEqual(residuals["x"][0], 22.0)
+
+        solution = client.run_solve_residuals(inputs)
+        self.assertAlmostEqual(solution["x"][0], 0.73205081, places=8)
+
+        jac = client.run_residual_gradients(inputs, {"x": np.array([4.0])})
+        self.assertEqual(jac[("x", "a")][0], 16.0)
+        self.assertEqual(jac[("x", "x")][0], 10.0)
+
+        # stop the servers and worker processes
+        server.stop(0)
+        implicit_server.stop(0)
+        explicit.close()
+        implicit.close()
+
+    def test_rosenbrock_batch(self):
+        """
+        Integration test for the batch evaluation of the Rosenbrock discipline.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Rosenbrock())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client._stream_options.num_double = 7
+
+        # transfer the stream options to the server
+        client.send_stream_options()
+
+        # run setup
+        client.send_options({"dimension": 3})
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        # evaluate a batch of points
+        x = np.random.default_rng(0).uniform(-2.0, 2.0, (10, 3))
+        outputs = client.run_compute_batch({"x": x})
+        jac = client.run_compute_partials_batch({"x": x})
+
+        self.assertEqual(outputs["f"].shape, (10, 1))
+        self.assertEqual(jac["f", "x"].shape, (10, 3))
+        for i in range(10):
+            self.assertAlmostEqual(outputs["f"][i, 0], rosen(x[i]))
+            np.testing.assert_allclose(jac["f", "x"][i], rosen_der(x[i]))
+
+        # stop the server
+        server.stop(0)
+
+    def test_rosenbrock_standard_server(self):
+        """
+        Integration test for the batch and fused evaluations against a server
+        that only implements the standard RPCs.
+        """
+        # server code (only the standard RPCs are registered)
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Rosenbrock())
+        disc.add_DisciplineServiceServicer_to_server(discipline, server)
+        add_array_stream_handlers(
+            server,
+            EXPLICIT_SERVICE,
+            {
+                "ComputeFunction": discipline.ComputeFunction,
+                "ComputeGradient": discipline.ComputeGradient,
+            },
+        )
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ExplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client.send_options({"dimension": 3})
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        # the points are evaluated one by one
+        x = np.random.default_rng(0).uniform(-2.0, 2.0, (4, 3))
+        outputs = client.run_compute_batch({"x": x})
+        jac = client.run_compute_partials_batch({"x": x})
+
+        for i in range(4):
+            self.assertAlmostEqual(outputs["f"][i, 0], rosen(x[i]))
+            np.testing.assert_allclose(jac["f", "x"][i], rosen_der(x[i]))
+
+        # the function and gradient are requested separately
+        outputs, jac = client.run_compute_with_partials({"x": x[0]})
+        self.assertAlmostEqual(outputs["f"][0], rosen(x[0]))
+        np.testing.assert_allclose(np.ravel(jac["f", "x"]), rosen_der(x[0]))
+
+        self.assertEqual(
+            client._unimplemented,
+            {"ComputeFunctionBatch", "ComputeGradientBatch", "ComputeFunctionAndGradient"},
+        )
+
+        # stop the server
+        server.stop(0)
+
     def test_quadratic_compute_residuals(self):
         """
         Integration test for the QuadraticImplicit compute function.
@@ -221,6 +631,93 @@ class IntegrationTests(unittest.TestCase):
         # stop the server
         server.stop(0)
 
+    def test_quadratic_state_vector_transport(self):
+        """
+        Integration test for the QuadraticImplicit discipline, transmitting
+        the variables as contiguous state vectors.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ImplicitServer(discipline=QuadradicImplicit())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ImplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+        client.state_vector_transport = True
+
+        # transfer the stream options to the server
+        client.send_stream_options()
+
+        # run setup
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+
+        # define some inputs
+        inputs = {"a": np.array([1.0]), "b": np.array([2.0]), "c": np.array([-2.0])}
+        outputs = {"x": np.array([4.0])}
+
+        # run residual, solve and gradient evaluations
+        residuals = client.run_compute_residuals(inputs, outputs)
+        self.assertEqual(residuals["x"][0], 22.0)
+
+        outputs = client.run_solve_residuals(inputs)
+        self.assertAlmostEqual(outputs["x"][0], 0.73205081, places=8)
+
+        jac = client.run_residual_gradients(inputs, {"x": np.array([4.0])})
+        self.assertEqual(jac[("x", "a")][0], 16.0)
+        self.assertEqual(jac[("x", "x")][0], 10.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_quadratic_shared_memory(self):
+        """
+        Integration test for the QuadraticImplicit discipline, transmitting
+        the variables through shared memory.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ImplicitServer(discipline=QuadradicImplicit())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        client = pmdo.ImplicitClient(channel=grpc.insecure_channel("localhost:50051"))
+
+        # run setup and negotiate the shared memory transport
+        client.run_setup()
+        client.get_variable_definitions()
+        client.get_partials_definitions()
+        client.enable_shared_memory()
+
+        # define some inputs
+        inputs = {"a": np.array([1.0]), "b": np.array([2.0]), "c": np.array([-2.0])}
+        outputs = {"x": np.array([4.0])}
+
+        # run residual, solve and gradient evaluations
+        residuals = client.run_compute_residuals(inputs, outputs)
+        self.assertEqual(residuals["x"][0], 22.0)
+
+        outputs = client.run_solve_residuals(inputs)
+        self.assertAlmostEqual(outputs["x"][0], 0.73205081, places=8)
+
+        jac = client.run_residual_gradients(inputs, {"x": np.array([4.0])})
+        self.assertEqual(jac[("x", "a")][0], 16.0)
+        self.assertEqual(jac[("x", "x")][0], 10.0)
+
+        client.disable_shared_memory()
+
+        # stop the server
+        server.stop(0)
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -114,6 +114,98 @@ class OpenMDAOIntegrationTests(unittest.TestCase):
         # stop the server
         server.stop(0)
 
+    def test_paraboloid_fused_partials(self):
+        """
+        Integration test for the Paraboloid discipline, computing the outputs
+        and partials with a single RPC.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        prob = om.Problem()
+        model = prob.model
+
+        paraboloid_comp = pmdo_om.RemoteExplicitComponent(
+            channel=grpc.insecure_channel("localhost:50051"), fuse_partials=True
+        )
+        model.add_subsystem("Paraboloid", paraboloid_comp)
+
+        # setup the problem
+        prob.setup()
+
+        # define some inputs
+        prob.set_val("Paraboloid.x", 1.0)
+        prob.set_val("Paraboloid.y", 2.0)
+
+        # the partials must not be requested separately at the same point
+        paraboloid_comp._client.run_compute_partials = None
+        prob.run_model()
+        jac = prob.compute_totals("Paraboloid.f_xy", ["Paraboloid.x", "Paraboloid.y"])
+
+        self.assertEqual(prob.get_val("Paraboloid.f_xy")[0], 39.0)
+        self.assertEqual(jac["Paraboloid.f_xy", "Paraboloid.x"][0], -2.0)
+        self.assertEqual(jac["Paraboloid.f_xy", "Paraboloid.y"][0], 13.0)
+
+        # stop the server
+        server.stop(0)
+
+    def test_paraboloid_client_cache(self):
+        """
+        Integration test for the Paraboloid discipline, repeating evaluations
+        at the same point with the client cache enabled.
+        """
+        # server code
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=10))
+
+        discipline = pmdo.ExplicitServer(discipline=Paraboloid())
+        discipline.attach_to_server(server)
+
+        server.add_insecure_port("[::]:50051")
+        server.start()
+
+        # client code
+        prob = om.Problem()
+        model = prob.model
+
+        paraboloid_comp = pmdo_om.RemoteExplicitComponent(
+            channel=grpc.insecure_channel("localhost:50051"), cache_size=2
+        )
+        model.add_subsystem("Paraboloid", paraboloid_comp)
+
+        # setup the problem
+        prob.setup()
+
+        prob.set_val("Paraboloid.x", 1.0)
+        prob.set_val("Paraboloid.y", 2.0)
+        prob.run_model()
+
+        # repeated evaluations must not contact the server
+        run_compute = paraboloid_comp._client.run_compute
+        paraboloid_comp._client.run_compute = None
+        prob.run_model()
+        self.assertEqual(prob.get_val("Paraboloid.f_xy")[0], 39.0)
+
+        # a new point is evaluated remotely
+        paraboloid_comp._client.run_compute = run_compute
+        prob.set_val("Paraboloid.x", 2.0)
+        prob.run_model()
+        self.assertEqual(prob.get_val("Paraboloid.f_xy")[0], 38.0)
+
+        self.assertEqual(
+            paraboloid_comp.get_cache_statistics(),
+            {"hits": 1, "misses": 2, "entries": 2},
+        )
+
+        # stop the server
+        server.stop(0)
+
     def test_rosenbrock_compute(self):
         """
         Integration test for the Paraboloid compute function.
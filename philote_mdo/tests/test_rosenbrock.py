@@ -90,6 +90,24 @@ class TestRosenbrock(unittest.TestCase):
 
         np.testing.assert_array_equal(jac["f", "x"], rosen_der(inputs["x"]))
 
+    def test_compute_batch(self):
+        """
+        Tests the vectorized batch functions of the Rosenbrock server.
+        """
+        x = np.array([[1.0, 2.0, 0.5], [0.0, -1.0, 3.0], [1.0, 1.0, 1.0]])
+        inputs = {"x": x}
+        outputs = {"f": np.zeros((3, 1))}
+        jac = utils.PairDict()
+        jac["f", "x"] = np.zeros((3, 3))
+
+        disc = Rosenbrock()
+        disc.compute_batch(inputs, outputs)
+        disc.compute_partials_batch(inputs, jac)
+
+        for i in range(3):
+            self.assertEqual(outputs["f"][i, 0], rosen(x[i]))
+            np.testing.assert_array_equal(jac["f", "x"][i], rosen_der(x[i]))
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -27,9 +27,25 @@
 # the linked websites, of the information, products, or services contained
 # therein. The DoD does not exercise any editorial, security, or other
 # control over the information you may find at these locations.
+import os
+import tempfile
 import unittest
+from concurrent import futures
 import numpy as np
-from philote_mdo.utils import get_chunk_indices, get_flattened_view
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.utils import (
+    get_chunk_indices,
+    get_flattened_view,
+    PackedArray,
+    serialize_array,
+    deserialize_array,
+    VariableLayout,
+    BufferArena,
+    EvaluationCache,
+    EvaluationStore,
+    evaluation_digest,
+    PairDict,
+)
 
 
 class TestUtils(unittest.TestCase):
@@ -75,6 +91,225 @@ class TestUtils(unittest.TestCase):
         self.assertIs(result_empty.base, empty_array)
         self.assertEqual(result_empty.shape, (0,))
 
+    def test_serialize_packed_array(self):
+        """
+        Tests that packed arrays are wire compatible with data.Array messages.
+        """
+        values = np.array([1.5, -2.0, 3.25, 1e300])
+        packed = PackedArray(
+            name="x", subname="y", start=3, end=6, type=data.kPartial, data=values
+        )
+        expected = data.Array(
+            name="x", subname="y", start=3, end=6, type=data.kPartial, data=values
+        )
+
+        self.assertEqual(serialize_array(packed), expected.SerializeToString())
+        self.assertEqual(serialize_array(expected), expected.SerializeToString())
+
+        # empty data is omitted, as for the standard encoding
+        empty = PackedArray(name="x", start=0, end=0, type=data.kOutput)
+        self.assertEqual(
+            serialize_array(empty),
+            data.Array(name="x", type=data.kOutput).SerializeToString(),
+        )
+
+    def test_deserialize_packed_array(self):
+        """
+        Tests decoding data.Array messages into packed arrays.
+        """
+        values = np.linspace(0.0, 1.0, 7)
+        buffer = data.Array(
+            name="f", start=7, end=13, type=data.kOutput, data=values
+        ).SerializeToString()
+
+        message = deserialize_array(buffer)
+        self.assertIsInstance(message, PackedArray)
+        self.assertEqual(message.name, "f")
+        self.assertEqual(message.subname, "")
+        self.assertEqual(message.start, 7)
+        self.assertEqual(message.end, 13)
+        self.assertEqual(message.type, data.kOutput)
+        np.testing.assert_array_equal(message.data, values)
+
+        # round trip through the packed encoding
+        message = deserialize_array(
+            serialize_array(PackedArray(name="g", type=data.kResidual, data=values))
+        )
+        self.assertEqual(message.name, "g")
+        self.assertEqual(message.type, data.kResidual)
+        np.testing.assert_array_equal(message.data, values)
+
+        # messages without data
+        message = deserialize_array(data.Array(name="h").SerializeToString())
+        self.assertEqual(message.name, "h")
+        self.assertEqual(message.data.size, 0)
+
+    def test_variable_layout(self):
+        """
+        Tests the precomputed variable and partials layout.
+        """
+        var_meta = [
+            data.VariableMetaData(name="x", type=data.kInput, shape=(2, 2)),
+            data.VariableMetaData(name="y", type=data.kInput, shape=(1,)),
+            data.VariableMetaData(name="f", type=data.kOutput, shape=(3,)),
+            data.VariableMetaData(name="g", type=data.kOutput, shape=(1,)),
+        ]
+        partials_meta = [
+            data.PartialsMetaData(name="f", subname="x"),
+            data.PartialsMetaData(name="f", subname="y"),
+            data.PartialsMetaData(name="g", subname="x"),
+            data.PartialsMetaData(name="g", subname="y"),
+        ]
+        layout = VariableLayout(var_meta, partials_meta)
+
+        self.assertEqual(layout.shapes["x"], (2, 2))
+        self.assertEqual(layout.sizes[data.kInput], 5)
+        self.assertEqual(layout.sizes[data.kOutput], 4)
+        self.assertEqual(layout.offsets(data.kInput), {"x": (0, 4), "y": (4, 5)})
+        self.assertEqual(layout.offsets(data.kOutput), {"f": (0, 3), "g": (3, 4)})
+
+        # partials shapes (including the scalar edge cases) and offsets
+        self.assertEqual(
+            [(pair, shape) for pair, shape, _, _ in layout.partials],
+            [
+                (("f", "x"), (3, 2, 2)),
+                (("f", "y"), (3,)),
+                (("g", "x"), (2, 2)),
+                (("g", "y"), (1,)),
+            ],
+        )
+        self.assertEqual(layout.partials_size, 20)
+
+        # allocated arrays are views into one contiguous vector
+        vector, inputs, flat_inputs = layout.allocate(data.kInput)
+        self.assertEqual(vector.shape, (5,))
+        self.assertEqual(inputs["x"].shape, (2, 2))
+        flat_inputs["y"][:] = 3.0
+        inputs["x"][1, 1] = 2.0
+        self.assertEqual(vector.tolist(), [0.0, 0.0, 0.0, 2.0, 3.0])
+
+        # packing named arrays into a contiguous vector
+        packed = layout.pack(data.kInput, {"y": 5.0, "x": np.eye(2)})
+        self.assertEqual(packed.tolist(), [1.0, 0.0, 0.0, 1.0, 5.0])
+
+        vector, jac, flat_jac = layout.allocate_partials()
+        self.assertEqual(vector.shape, (20,))
+        self.assertEqual(jac["f", "x"].shape, (3, 2, 2))
+        self.assertEqual(flat_jac["g", "y"].shape, (1,))
+
+        # the layout is invalidated when the metadata changes
+        self.assertTrue(layout.matches(var_meta, partials_meta))
+        var_meta.append(data.VariableMetaData(name="z", type=data.kInput, shape=(1,)))
+        self.assertFalse(layout.matches(var_meta, partials_meta))
+        self.assertFalse(layout.matches(list(var_meta), partials_meta))
+
+    def test_buffer_arena(self):
+        """
+        Tests that the buffer arena reuses (and zeroes) its arrays.
+        """
+        var_meta = [
+            data.VariableMetaData(name="x", type=data.kInput, shape=(3,)),
+            data.VariableMetaData(name="f", type=data.kOutput, shape=(2,)),
+        ]
+        partials_meta = [data.PartialsMetaData(name="f", subname="x")]
+        arena = BufferArena(VariableLayout(var_meta, partials_meta))
+
+        vector1, inputs1, flat_inputs1 = arena.allocate(data.kInput)
+        inputs1["x"][:] = 1.0
+        inputs1["x"] = np.ones(3)
+        vector2, inputs2, flat_inputs2 = arena.allocate(data.kInput)
+
+        self.assertIs(vector1, vector2)
+        self.assertIsNot(inputs1, inputs2)
+        self.assertIs(inputs2["x"].base, vector2)
+        self.assertIs(flat_inputs1["x"], flat_inputs2["x"])
+        self.assertEqual(vector2.tolist(), [0.0, 0.0, 0.0])
+
+        vector1, jac1, _ = arena.allocate_partials()
+        jac1["f", "x"][:] = 2.0
+        vector2, jac2, _ = arena.allocate_partials()
+        self.assertIs(vector1, vector2)
+        self.assertEqual(jac2["f", "x"].shape, (2, 3))
+        self.assertFalse(jac2["f", "x"].any())
+
+    def test_evaluation_cache(self):
+        """
+        Tests the LRU eviction and statistics of the evaluation cache.
+        """
+        cache = EvaluationCache(max_bytes=3 * 8 * 4, max_entries=None)
+        keys = [evaluation_digest("f", np.array([float(i)])) for i in range(4)]
+
+        self.assertNotEqual(keys[0], keys[1])
+        self.assertEqual(keys[0], evaluation_digest("f", np.array([0.0])))
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual(cache.misses, 1)
+
+        # stored results are copies
+        result = {"f": np.zeros(4)}
+        cache.put(keys[0], result)
+        result["f"][:] = 1.0
+        np.testing.assert_array_equal(cache.get(keys[0])["f"], np.zeros(4))
+        self.assertEqual(cache.hits, 1)
+
+        # the least recently used result is evicted once the memory bound is
+        # exceeded (key 1 is evicted, as key 0 was just used)
+        cache.put(keys[1], {"f": np.ones(4)})
+        cache.get(keys[0])
+        cache.put(keys[2], {"f": np.ones(4)})
+        cache.put(keys[3], {"f": np.ones(4)})
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.nbytes, 3 * 8 * 4)
+        self.assertIsNone(cache.get(keys[1]))
+        self.assertIsNotNone(cache.get(keys[0]))
+
+        # entry bound and tuples of results
+        cache = EvaluationCache(max_entries=1)
+        cache.put(keys[0], ({"f": np.ones(1)}, {"g": np.ones(2)}))
+        cache.put(keys[1], ({"f": np.ones(1)}, {"g": np.ones(2)}))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.get(keys[1])[1]["g"].shape, (2,))
+
+    def test_evaluation_store(self):
+        """
+        Tests that the evaluation store persists results across instances.
+        """
+        with tempfile.TemporaryDirectory() as path:
+            store = EvaluationStore(path)
+            key = evaluation_digest("f", np.array([1.0, 2.0]))
+
+            jac = PairDict()
+            jac["f", "x"] = np.array([[1.0, 2.0]])
+            store.put(key, ({"f": np.array([3.0])}, jac), inputs=np.array([1.0, 2.0]))
+
+            self.assertIsNone(store.get(evaluation_digest("g")))
+            self.assertEqual(len(store), 1)
+            store.close()
+
+            # a new store (e.g., after a restart) serves the stored result
+            store = EvaluationStore(path)
+            out, jac = store.get(key)
+
+            self.assertIsInstance(jac, PairDict)
+            np.testing.assert_array_equal(out["f"], [3.0])
+            np.testing.assert_array_equal(jac["f", "x"], [[1.0, 2.0]])
+            np.testing.assert_array_equal(store.get_inputs(key), [1.0, 2.0])
+            self.assertEqual((store.hits, store.misses), (1, 0))
+
+            # concurrent writers of the same result
+            other = evaluation_digest("g", np.array([1.0]))
+            with futures.ThreadPoolExecutor(max_workers=4) as executor:
+                for _ in range(8):
+                    executor.submit(store.put, other, {"g": np.arange(3.0)})
+            np.testing.assert_array_equal(store.get(other)["g"], np.arange(3.0))
+            self.assertEqual(len(os.listdir(os.path.join(path, "blobs"))), 2)
+
+            # blobs that were already removed are tolerated
+            os.remove(os.path.join(path, "blobs", other.hex() + ".npy"))
+            store.clear()
+            self.assertEqual(len(store), 0)
+            self.assertIsNone(store.get(key))
+            store.close()
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -29,3 +29,13 @@
 # control over the information you may find at these locations.
 from .pair_dict import PairDict
 from .helper import get_chunk_indices, get_flattened_view
+from .packed_array import PackedArray, serialize_array, deserialize_array
+from .variable_layout import (
+    VariableLayout,
+    BufferArena,
+    get_partials_shape,
+    STATE_VECTOR_NAME,
+)
+from .evaluation_cache import EvaluationCache, evaluation_digest
+from .evaluation_store import EvaluationStore
+from .shared_memory import SharedBuffers, SHARED_MEMORY_NAME
@@ -0,0 +1,164 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def _copy_result(result):
+    """
+    Copies a result (a dictionary of arrays or a tuple of such dictionaries).
+    """
+    if isinstance(result, tuple):
+        return tuple(_copy_result(item) for item in result)
+
+    copy = type(result)()
+    for key, value in result.items():
+        copy[key] = np.array(value, dtype=float, copy=True)
+    return copy
+
+
+def _result_nbytes(result):
+    """
+    Returns the number of bytes held by the arrays of a result.
+    """
+    if isinstance(result, tuple):
+        return sum(_result_nbytes(item) for item in result)
+
+    return sum(value.nbytes for value in result.values())
+
+
+def evaluation_digest(*parts):
+    """
+    Computes a digest identifying an evaluation.
+
+    The parts may be strings, bytes or NumPy arrays (which are hashed by
+    shape and raw contents).
+    """
+    h = hashlib.blake2b(digest_size=20)
+
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode()
+
+        if isinstance(part, np.ndarray):
+            part = np.ascontiguousarray(part)
+            h.update(str(part.shape).encode())
+            h.update(part.view(np.uint8).reshape(-1))
+        else:
+            h.update(len(part).to_bytes(8, "little"))
+            h.update(part)
+
+    return h.digest()
+
+
+class EvaluationCache:
+    """
+    Memory-bounded LRU cache of discipline evaluation results.
+
+    Results are stored under a digest of the evaluation (see
+    evaluation_digest). Once the stored arrays exceed max_bytes (or the
+    number of entries exceeds max_entries), the least recently used results
+    are evicted. The cache is thread safe.
+    """
+
+    def __init__(self, max_bytes=256 * 1024**2, max_entries=None):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+        # cache statistics
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """
+        Number of bytes held by the cached arrays.
+        """
+        return self._nbytes
+
+    def get(self, key):
+        """
+        Returns the cached result for a key (or None) and updates the hit and
+        miss counters.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, result, inputs=None):
+        """
+        Stores a copy of a result (a dictionary of arrays or a tuple of such
+        dictionaries). Results larger than the memory bound are not cached.
+        The inputs are not kept in memory.
+        """
+        result = _copy_result(result)
+        nbytes = _result_nbytes(result)
+
+        if nbytes > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._nbytes -= self._entries.pop(key)[1]
+
+            self._entries[key] = (result, nbytes)
+            self._nbytes += nbytes
+
+            # evict the least recently used results
+            while self._nbytes > self.max_bytes or (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._nbytes -= evicted
+
+    def clear(self):
+        """
+        Removes all cached results (the statistics are kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
@@ -0,0 +1,245 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+
+import numpy as np
+from philote_mdo.utils.pair_dict import PairDict
+
+
+def _flatten_result(result):
+    """
+    Flattens a result (a dictionary of arrays or a tuple of such
+    dictionaries) into one vector and a manifest describing its arrays.
+    """
+    items = result if isinstance(result, tuple) else (result,)
+
+    manifest = {"tuple": isinstance(result, tuple), "items": []}
+    arrays = []
+    offset = 0
+
+    for item in items:
+        entries = []
+        for key, value in item.items():
+            value = np.asarray(value, dtype=float)
+            name = list(key) if isinstance(key, tuple) else key
+            entries.append([name, offset, list(value.shape)])
+            arrays.append(value.ravel())
+            offset += value.size
+
+        manifest["items"].append(
+            {"pairs": isinstance(item, PairDict), "arrays": entries}
+        )
+
+    if arrays:
+        vector = np.concatenate(arrays)
+    else:
+        vector = np.zeros(0)
+
+    return vector, manifest
+
+
+def _unflatten_result(vector, manifest):
+    """
+    Recreates a result from its vector and manifest. The arrays of the
+    result are views into the vector.
+    """
+    items = []
+    for item in manifest["items"]:
+        result = PairDict() if item["pairs"] else {}
+
+        for key, offset, shape in item["arrays"]:
+            size = int(np.prod(shape))
+            value = vector[offset : offset + size].reshape(shape)
+
+            if item["pairs"]:
+                result[tuple(key)] = value
+            else:
+                result[key] = value
+
+        items.append(result)
+
+    if manifest["tuple"]:
+        return tuple(items)
+    return items[0]
+
+
+class EvaluationStore:
+    """
+    Persistent on-disk store of discipline evaluation results.
+
+    The store is a drop-in replacement for EvaluationCache (it is assigned
+    to the cache attribute of a server), but it is never evicted and
+    survives restarts of the server. Every evaluation is appended as one
+    NumPy file holding the inputs and results. An SQLite database indexes
+    these files by the evaluation digest. Stored results are loaded as
+    read-only memory maps, so only the accessed values are read from disk.
+
+    The cache keys of the servers include the discipline class, the options
+    and the variable layout. A store should nevertheless only be shared by
+    servers of the same discipline (implementation), as results are not
+    distinguished by anything else.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.join(path, "blobs"), exist_ok=True)
+
+        # cache statistics
+        self.hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(path, "index.sqlite"), check_same_thread=False
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS evaluations ("
+            "key BLOB PRIMARY KEY, file TEXT NOT NULL, "
+            "num_inputs INTEGER NOT NULL, manifest TEXT NOT NULL)"
+        )
+        self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def _lookup(self, key):
+        """
+        Returns the file, number of input values and manifest of a key.
+        """
+        with self._lock:
+            return self._db.execute(
+                "SELECT file, num_inputs, manifest FROM evaluations WHERE key = ?",
+                (key,),
+            ).fetchone()
+
+    def _load(self, file):
+        """
+        Memory maps a stored evaluation vector.
+        """
+        return np.load(os.path.join(self.path, "blobs", file), mmap_mode="r")
+
+    def get(self, key):
+        """
+        Returns the stored result for a key (or None) and updates the hit and
+        miss counters.
+        """
+        row = self._lookup(key)
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        file, num_inputs, manifest = row
+        vector = self._load(file)
+
+        with self._lock:
+            self.hits += 1
+        return _unflatten_result(vector[num_inputs:], json.loads(manifest))
+
+    def get_inputs(self, key):
+        """
+        Returns the input values (the received state vectors, concatenated)
+        of a stored evaluation, or None.
+        """
+        row = self._lookup(key)
+        if row is None:
+            return None
+
+        file, num_inputs, _ = row
+        return self._load(file)[:num_inputs]
+
+    def put(self, key, result, inputs=None):
+        """
+        Appends a result (and optionally the inputs it was computed from) to
+        the store.
+
+        The data file is written to a unique temporary file and flushed to
+        disk before it is renamed and indexed, so that neither concurrent
+        writers nor an interrupted write leave a partial entry behind.
+        Results that are already stored are not written again.
+        """
+        if self._lookup(key) is not None:
+            return
+
+        vector, manifest = _flatten_result(result)
+
+        if inputs is None:
+            inputs = np.zeros(0)
+        inputs = np.asarray(inputs, dtype=float).ravel()
+
+        file = key.hex() + ".npy"
+        directory = os.path.join(self.path, "blobs")
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                np.save(f, np.concatenate((inputs, vector)))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporary, os.path.join(directory, file))
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?)",
+                (key, file, inputs.size, json.dumps(manifest)),
+            )
+            self._db.commit()
+
+    def clear(self):
+        """
+        Removes all stored results (the statistics are kept).
+        """
+        with self._lock:
+            files = [row[0] for row in self._db.execute("SELECT file FROM evaluations")]
+            self._db.execute("DELETE FROM evaluations")
+            self._db.commit()
+
+        for file in files:
+            try:
+                os.remove(os.path.join(self.path, "blobs", file))
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        """
+        Closes the index database.
+        """
+        with self._lock:
+            self._db.close()
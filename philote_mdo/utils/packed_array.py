@@ -0,0 +1,205 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import numpy as np
+import philote_mdo.generated.data_pb2 as data
+
+
+# wire tag of the data.Array 'data' field (field number 6, length delimited)
+_DATA_FIELD = 6
+_DATA_TAG = bytes([(_DATA_FIELD << 3) | 2])
+
+
+class PackedArray:
+    """
+    Array chunk that stores its continuous data as a NumPy array.
+
+    This class mirrors the fields of the data.Array message, so that servers
+    and clients can use either type interchangeably. Instead of copying every
+    value into the repeated 'data' field, the values are written to (and read
+    from) the wire as one block of little-endian doubles. This is exactly how
+    proto3 encodes the packed 'data' field, so packed arrays are wire
+    compatible with regular data.Array messages.
+    """
+
+    __slots__ = ("name", "subname", "start", "end", "type", "data")
+
+    def __init__(self, name="", subname="", start=0, end=0, type=data.kInput, data=None):
+        self.name = name
+        self.subname = subname
+        self.start = start
+        self.end = end
+        self.type = type
+
+        if data is None:
+            data = np.zeros(0)
+        self.data = data
+
+    def __eq__(self, other):
+        """
+        Compares the array chunk to another PackedArray or data.Array.
+        """
+        if not isinstance(other, (PackedArray, data.Array)):
+            return NotImplemented
+
+        return (
+            self.name == other.name
+            and self.subname == other.subname
+            and self.start == other.start
+            and self.end == other.end
+            and self.type == other.type
+            and np.array_equal(np.asarray(self.data), np.asarray(other.data))
+        )
+
+    def __repr__(self):
+        return "PackedArray(name={!r}, subname={!r}, start={}, end={}, type={}, data={!r})".format(
+            self.name, self.subname, self.start, self.end, self.type, self.data
+        )
+
+
+def _encode_varint(value):
+    """
+    Encodes a non-negative integer as a protobuf varint.
+    """
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _decode_varint(buffer, pos):
+    """
+    Decodes a protobuf varint starting at pos. Returns the value and the
+    position after the varint.
+    """
+    result = 0
+    shift = 0
+    while True:
+        byte = buffer[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def serialize_array(message):
+    """
+    Serializes an array chunk to the data.Array wire format.
+
+    Both data.Array messages and PackedArray objects are accepted. For packed
+    arrays, the continuous data is appended as a single little-endian byte
+    block instead of being copied element by element.
+    """
+    if isinstance(message, data.Array):
+        return message.SerializeToString()
+
+    header = data.Array(
+        name=message.name,
+        subname=message.subname,
+        start=message.start,
+        end=message.end,
+        type=message.type,
+    ).SerializeToString()
+
+    values = np.ascontiguousarray(message.data, dtype="<f8")
+    if values.size == 0:
+        return header
+
+    return b"".join(
+        (header, _DATA_TAG, _encode_varint(values.nbytes), values.tobytes())
+    )
+
+
+def deserialize_array(buffer):
+    """
+    Deserializes a data.Array wire message into a PackedArray.
+
+    The continuous data is not parsed by protobuf. Instead, it is wrapped
+    with np.frombuffer (read-only and without a copy). Messages that do not
+    use the packed encoding for the 'data' field are parsed by protobuf as a
+    fallback.
+    """
+    pos = 0
+    size = len(buffer)
+    block = None
+
+    while pos < size:
+        key_start = pos
+        key, pos = _decode_varint(buffer, pos)
+        field = key >> 3
+        wire_type = key & 0x7
+
+        if wire_type == 0:
+            _, pos = _decode_varint(buffer, pos)
+        elif wire_type == 1:
+            pos += 8
+        elif wire_type == 2:
+            length, pos = _decode_varint(buffer, pos)
+            if field == _DATA_FIELD:
+                if block is not None:
+                    block = None
+                    break
+                block = (key_start, pos, length)
+            pos += length
+        elif wire_type == 5:
+            pos += 4
+        else:
+            block = None
+            break
+
+        # unpacked doubles (or a malformed message) are left to protobuf
+        if field == _DATA_FIELD and wire_type != 2:
+            block = None
+            break
+
+    if block is None:
+        message = data.Array.FromString(buffer)
+        return PackedArray(
+            name=message.name,
+            subname=message.subname,
+            start=message.start,
+            end=message.end,
+            type=message.type,
+            data=np.array(message.data),
+        )
+
+    key_start, begin, length = block
+    header = data.Array.FromString(buffer[:key_start] + buffer[begin + length :])
+
+    return PackedArray(
+        name=header.name,
+        subname=header.subname,
+        start=header.start,
+        end=header.end,
+        type=header.type,
+        data=np.frombuffer(buffer, dtype="<f8", count=length // 8, offset=begin),
+    )
@@ -0,0 +1,282 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import json
+import os
+import secrets
+import sys
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.utils.pair_dict import PairDict
+
+
+# reserved array name of the "buffers ready" signal of the shared memory
+# transport (an array chunk without data)
+SHARED_MEMORY_NAME = "__philote_shared__"
+
+# variable types that have a shared memory segment
+_SHARED_TYPES = (data.kInput, data.kOutput, data.kResidual)
+
+
+# serializes the creation of segments with attaching to segments (which
+# temporarily disables the resource tracker registration)
+_tracker_lock = threading.Lock()
+
+
+def _attach_segment(name):
+    """
+    Attaches to an existing shared memory segment.
+
+    The segment is owned (and unlinked) by the process that created it, so it
+    is not registered with the resource tracker of the attaching process.
+    Note, that unregistering the segment after attaching is not an option, as
+    spawned processes share the resource tracker of their parent (which
+    would then lose the registration of the owner).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+
+    with _tracker_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+def _check_owner(segment):
+    """
+    Checks that an attached segment is owned by the user of this process, so
+    that a client can not make the server read or write memory of another
+    user.
+    """
+    fd = getattr(segment, "_fd", -1)
+    if fd < 0 or not hasattr(os, "getuid"):
+        # the segment has no file descriptor on this platform
+        return
+
+    if os.fstat(fd).st_uid != os.getuid():
+        raise ValueError(
+            "Shared memory segment '{}' is owned by another user.".format(segment.name)
+        )
+
+
+def _create_segment(size):
+    """
+    Creates a new shared memory segment (registered with the resource
+    tracker, so that it is unlinked if the owner exits unexpectedly).
+    """
+    with _tracker_lock:
+        return shared_memory.SharedMemory(create=True, size=size)
+
+
+class SharedBuffers:
+    """
+    Variable and partials buffers that live in shared memory segments.
+
+    One segment is allocated for the inputs, outputs, residuals and partials
+    of a layout. The client creates the segments and the server attaches to
+    them by name, so that both processes read and write the same memory.
+    The buffers have the same allocation interface as VariableLayout and
+    BufferArena. The variable arrays are not zeroed on allocation (they hold
+    the values last written by either side), but the partials are.
+
+    Every set of buffers is identified by a random token, which the client
+    sends along with the segment names and with every compute request, so
+    that the server can tell the buffers of different clients apart.
+    """
+
+    def __init__(self, layout, names=None, token=None):
+        self.layout = layout
+        self._owner = names is None
+        self._segments = {}
+
+        if token is None:
+            token = secrets.token_hex(16)
+        self.token = token
+
+        sizes = {str(t): layout.sizes.get(t, 0) for t in _SHARED_TYPES}
+        sizes["partials"] = layout.partials_size
+
+        try:
+            for key, size in sizes.items():
+                # segments can not be empty
+                nbytes = max(size, 1) * np.dtype(float).itemsize
+
+                if self._owner:
+                    self._segments[key] = _create_segment(nbytes)
+                    continue
+
+                if not isinstance(names.get(key), str):
+                    raise ValueError("Missing shared memory segment '{}'.".format(key))
+
+                segment = _attach_segment(names[key])
+                self._segments[key] = segment
+                _check_owner(segment)
+
+                if segment.size < nbytes:
+                    raise ValueError(
+                        "Shared memory segment '{}' is smaller than the "
+                        "layout of the discipline.".format(key)
+                    )
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+        # contiguous vectors and variable views into the segments
+        self.vectors = {}
+        self._views = {}
+        for var_type in _SHARED_TYPES:
+            vector = self._vector(str(var_type), layout.sizes.get(var_type, 0))
+            self.vectors[var_type] = vector
+
+            arrays = {}
+            flat_arrays = {}
+            for name, shape, begin, end in layout.variables.get(var_type, []):
+                flat_arrays[name] = vector[begin:end]
+                arrays[name] = flat_arrays[name].reshape(shape)
+            self._views[var_type] = (arrays, flat_arrays)
+
+        self.partials = self._vector("partials", layout.partials_size)
+        self._partials = (PairDict(), PairDict())
+        for pair, shape, begin, end in layout.partials:
+            self._partials[1][pair] = self.partials[begin:end]
+            self._partials[0][pair] = self._partials[1][pair].reshape(shape)
+
+    def _vector(self, key, size):
+        """
+        Returns a vector view of a segment.
+        """
+        return np.ndarray((size,), dtype=float, buffer=self._segments[key].buf)
+
+    def names(self):
+        """
+        Returns the names of the segments (used by the server to attach).
+        """
+        return {key: segment.name for key, segment in self._segments.items()}
+
+    def to_json(self):
+        """
+        Serializes the segment names for the transport negotiation.
+        """
+        return json.dumps(self.names())
+
+    @classmethod
+    def from_json(cls, layout, names, token=None):
+        """
+        Attaches to the segments described by the negotiated names.
+
+        A ValueError is raised, if the names are malformed or the segments do
+        not fit the layout.
+        """
+        try:
+            names = json.loads(names)
+        except ValueError:
+            raise ValueError("Malformed shared memory segment names.")
+
+        if not isinstance(names, dict):
+            raise ValueError("Malformed shared memory segment names.")
+
+        return cls(layout, names=names, token=token)
+
+    def allocate(self, var_type, arrays=None, flat_arrays=None):
+        """
+        Returns the shared arrays for all variables of a type.
+        """
+        if arrays is None:
+            arrays = {}
+        if flat_arrays is None:
+            flat_arrays = {}
+
+        shared, shared_flat = self._views[var_type]
+        arrays.update(shared)
+        flat_arrays.update(shared_flat)
+
+        return self.vectors[var_type], arrays, flat_arrays
+
+    def allocate_partials(self):
+        """
+        Returns the zeroed shared arrays for all declared partials.
+        """
+        self.partials.fill(0.0)
+
+        partials = PairDict()
+        flat_partials = PairDict()
+        partials.update(self._partials[0])
+        flat_partials.update(self._partials[1])
+
+        return self.partials, partials, flat_partials
+
+    def arrays(self, var_type):
+        """
+        Returns the shared arrays of a variable type (or the partials) as they
+        are, without zeroing them.
+        """
+        if var_type == data.kPartial:
+            return self._partials[0]
+
+        return self._views[var_type][0]
+
+    def write(self, var_type, arrays):
+        """
+        Copies a dictionary of arrays into the shared arrays of a type.
+        Arrays that already are the shared arrays are skipped.
+        """
+        shared = self.arrays(var_type)
+
+        for name, value in arrays.items():
+            if name in shared and shared[name] is not value:
+                shared[name][...] = value
+
+    def close(self):
+        """
+        Releases the segments. The owner (client) also unlinks them.
+        """
+        # the arrays must be released before the segments are closed
+        self.vectors = {}
+        self._views = {}
+        self.partials = None
+        self._partials = (PairDict(), PairDict())
+
+        for segment in self._segments.values():
+            if self._owner:
+                segment.unlink()
+
+            # arrays still referenced elsewhere keep the mapping alive until
+            # they are garbage collected
+            try:
+                segment.close()
+            except BufferError:
+                pass
+
+        self._segments = {}
@@ -0,0 +1,307 @@
+# Philote-Python
+#
+# Copyright 2022-2024 Christopher A. Lupp
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+#
+# This work has been cleared for public release, distribution unlimited, case
+# number: AFRL-2023-5713.
+#
+# The views expressed are those of the authors and do not reflect the
+# official guidance or position of the United States Government, the
+# Department of Defense or of the United States Air Force.
+#
+# Statement from DoD: The Appearance of external hyperlinks does not
+# constitute endorsement by the United States Department of Defense (DoD) of
+# the linked websites, of the information, products, or services contained
+# therein. The DoD does not exercise any editorial, security, or other
+# control over the information you may find at these locations.
+import numpy as np
+import philote_mdo.generated.data_pb2 as data
+from philote_mdo.utils.pair_dict import PairDict
+from philote_mdo.utils.evaluation_cache import evaluation_digest
+
+
+# reserved array name for chunks of the contiguous state vector of a variable
+# type (all variables of that type, packed in layout order)
+STATE_VECTOR_NAME = "__philote_state__"
+
+
+def get_partials_shape(shapef, shapex):
+    """
+    Returns the shape of the partials of f with respect to x.
+
+    Note: there are edge cases for this function, where either f or x, or
+    both are scalar. In those cases the shapes of the partials must be
+    treated differently.
+    """
+    if shapef == (1,):
+        if shapex == (1,):
+            shape = (1,)
+        else:
+            shape = shapex
+    elif shapex == (1,):
+        shape = shapef
+    else:
+        shape = shapef + shapex
+
+    return shape
+
+
+class VariableLayout:
+    """
+    Precomputed index of the variable and partials metadata of a discipline.
+
+    The layout is compiled once from the metadata and then reused by every
+    compute call. It stores the shape of every variable, the flat offsets of
+    the variables of each type and the shapes and flat offsets of the
+    partials. Variables of the same type (and all partials) are laid out
+    contiguously, so that they can be allocated as views into one vector.
+    """
+
+    def __init__(self, var_meta, partials_meta):
+        # metadata the layout was compiled from
+        self._var_meta = var_meta
+        self._partials_meta = partials_meta
+        self._num_vars = len(var_meta)
+        self._num_partials = len(partials_meta)
+
+        # variable name -> shape (the first definition of a name is used)
+        self.shapes = {}
+
+        # variable type -> list of (name, shape, begin, end)
+        self.variables = {}
+
+        # variable type -> total number of values
+        self.sizes = {}
+
+        for var in var_meta:
+            shape = tuple(var.shape)
+            self.shapes.setdefault(var.name, shape)
+
+            begin = self.sizes.get(var.type, 0)
+            end = begin + int(np.prod(shape))
+            self.variables.setdefault(var.type, []).append(
+                (var.name, shape, begin, end)
+            )
+            self.sizes[var.type] = end
+
+        # list of ((name, subname), shape, begin, end)
+        self.partials = []
+        self.partials_size = 0
+
+        for pair in partials_meta:
+            shape = get_partials_shape(self.shapes[pair.name], self.shapes[pair.subname])
+            begin = self.partials_size
+            end = begin + int(np.prod(shape))
+            self.partials.append(((pair.name, pair.subname), shape, begin, end))
+            self.partials_size = end
+
+        # computed on first use
+        self._digest = None
+
+    def digest(self):
+        """
+        Returns a digest of the variable names, types and shapes and of the
+        partials pairs.
+
+        Two layouts with the same digest map contiguous vectors to the same
+        variables.
+        """
+        if self._digest is None:
+            parts = []
+            for var_type in sorted(self.variables):
+                for name, shape, _, _ in self.variables[var_type]:
+                    parts.append("{}:{}:{}".format(var_type, name, shape))
+            for pair, shape, _, _ in self.partials:
+                parts.append("{}:{}".format(pair, shape))
+
+            self._digest = evaluation_digest(*parts)
+
+        return self._digest
+
+    def matches(self, var_meta, partials_meta):
+        """
+        Checks if the layout was compiled from the given metadata lists.
+
+        The metadata lists are only ever appended to or replaced, so
+        comparing their identity and length is sufficient.
+        """
+        return (
+            var_meta is self._var_meta
+            and partials_meta is self._partials_meta
+            and len(var_meta) == self._num_vars
+            and len(partials_meta) == self._num_partials
+        )
+
+    def offsets(self, var_type):
+        """
+        Returns a dictionary mapping the variable names of a type to their
+        (begin, end) offsets in the contiguous vector of that type.
+        """
+        return {
+            name: (begin, end)
+            for name, _, begin, end in self.variables.get(var_type, [])
+        }
+
+    def allocate(self, var_type, arrays=None, flat_arrays=None):
+        """
+        Allocates zero-initialized arrays for all variables of a type.
+
+        All arrays are views into one contiguous vector, which is returned.
+        The shaped arrays and flat views are stored in the (optionally
+        provided) dictionaries.
+        """
+        if arrays is None:
+            arrays = {}
+        if flat_arrays is None:
+            flat_arrays = {}
+
+        vector = np.zeros(self.sizes.get(var_type, 0))
+
+        for name, shape, begin, end in self.variables.get(var_type, []):
+            flat_arrays[name] = vector[begin:end]
+            arrays[name] = flat_arrays[name].reshape(shape)
+
+        return vector, arrays, flat_arrays
+
+    def pack(self, var_type, arrays, vector=None):
+        """
+        Packs the arrays of all variables of a type into one contiguous vector
+        (in layout order).
+
+        Parameters
+        ----------
+        var_type : VariableType
+            the type of the variables that are packed
+        arrays : dict
+            dictionary containing the arrays of all variables of the type
+        vector : np.ndarray
+            optional vector to pack into (a new vector is created otherwise)
+        """
+        if vector is None:
+            vector = np.empty(self.sizes.get(var_type, 0))
+
+        for name, _, begin, end in self.variables.get(var_type, []):
+            vector[begin:end] = np.ravel(arrays[name])
+
+        return vector
+
+    def allocate_partials(self):
+        """
+        Allocates zero-initialized arrays for all declared partials.
+
+        All partials are views into one contiguous vector. Returns the
+        vector, the partials and the flat views of the partials.
+        """
+        partials = PairDict()
+        flat_partials = PairDict()
+
+        vector = np.zeros(self.partials_size)
+
+        for pair, shape, begin, end in self.partials:
+            flat_partials[pair] = vector[begin:end]
+            partials[pair] = flat_partials[pair].reshape(shape)
+
+        return vector, partials, flat_partials
+
+    def allocate_batch(self, var_type, num_points):
+        """
+        Allocates zero-initialized arrays with a leading batch axis for all
+        variables of a type.
+
+        Each variable occupies one contiguous block of the returned vector,
+        so that its flat view is the concatenation of all points.
+        """
+        arrays = {}
+        flat_arrays = {}
+
+        vector = np.zeros(num_points * self.sizes.get(var_type, 0))
+
+        for name, shape, begin, end in self.variables.get(var_type, []):
+            flat_arrays[name] = vector[num_points * begin : num_points * end]
+            arrays[name] = flat_arrays[name].reshape((num_points,) + shape)
+
+        return vector, arrays, flat_arrays
+
+    def allocate_partials_batch(self, num_points):
+        """
+        Allocates zero-initialized partials with a leading batch axis.
+        """
+        partials = PairDict()
+        flat_partials = PairDict()
+
+        vector = np.zeros(num_points * self.partials_size)
+
+        for pair, shape, begin, end in self.partials:
+            flat_partials[pair] = vector[num_points * begin : num_points * end]
+            partials[pair] = flat_partials[pair].reshape((num_points,) + shape)
+
+        return vector, partials, flat_partials
+
+
+class BufferArena:
+    """
+    Persistent buffers for the variables and partials of a layout.
+
+    The arena has the same allocation interface as VariableLayout. The
+    buffers are allocated on first use and then zeroed and handed out again
+    for every subsequent call, which avoids allocating (and page faulting)
+    large arrays in every compute call. Note, that the arrays returned by one
+    call are overwritten by the next call.
+    """
+
+    def __init__(self, layout):
+        self.layout = layout
+        self._buffers = {}
+        self._partials = None
+
+    def allocate(self, var_type, arrays=None, flat_arrays=None):
+        """
+        Returns the zeroed persistent arrays for all variables of a type.
+
+        The dictionaries are new for every call (so that rebinding an entry
+        does not affect the arena), but the arrays are reused.
+        """
+        if arrays is None:
+            arrays = {}
+        if flat_arrays is None:
+            flat_arrays = {}
+
+        if var_type not in self._buffers:
+            self._buffers[var_type] = self.layout.allocate(var_type)
+
+        vector, cached, cached_flat = self._buffers[var_type]
+        vector.fill(0.0)
+        arrays.update(cached)
+        flat_arrays.update(cached_flat)
+
+        return vector, arrays, flat_arrays
+
+    def allocate_partials(self):
+        """
+        Returns the zeroed persistent arrays for all declared partials.
+        """
+        if self._partials is None:
+            self._partials = self.layout.allocate_partials()
+
+        vector, cached, cached_flat = self._partials
+        vector.fill(0.0)
+
+        partials = PairDict()
+        flat_partials = PairDict()
+        partials.update(cached)
+        flat_partials.update(cached_flat)
+
+        return vector, partials, flat_partials